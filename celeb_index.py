@@ -0,0 +1,338 @@
+# Imports the OpenCV library for image and video processing.
+import cv2
+# Imports the NumPy library for efficient array and matrix operations.
+import numpy as np
+# Imports the operating system module for file paths and file dates.
+import os
+# Imports the hashlib module for the content hash of the celebrity images.
+import hashlib
+# Imports the threading module for the lock shared by the app and its worker threads.
+import threading
+# Imports the frame sources helper listing the celebrities.
+from frame_sources import list_celebrities
+
+# Index des célébrités de celebs/ : landmarks précalculés (le swap n'a plus besoin de détecter le visage).
+# Construit une fois (python celeb_index.py), puis mis à jour seulement pour les images modifiées.
+
+
+# Sets the version of the index file format (a different version forces a full rebuild).
+INDEX_VERSION = 2
+
+# Sets the default path of the index file.
+DEFAULT_INDEX_PATH = os.path.join("cache", "celebs_index.npz")
+
+# Sets the default folder of the thumbnail cache.
+DEFAULT_THUMBNAIL_FOLDER = os.path.join("cache", "thumbnails")
+
+
+# Defines the function hashing the content of a file.
+def file_hash(path):
+    # Returns the SHA-1 of the file content.
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+# Defines the function computing the index entry of one image.
+def compute_entry(engine, image):
+    """Retourne les données précalculées d'une image (landmarks à None si aucun visage n'est détecté)."""
+    # Detects the 68 landmarks (the hull, mask and color stats of the swap are derived from them per swap).
+    return {"landmarks": engine.get_landmarks(image, engine.still_detection_scale(image))}
+
+
+# Defines the index of the celebrity images.
+class CelebIndex:
+    # Sets the docstring describing the class's purpose.
+    """Index versionné des célébrités, invalidé par la date/taille puis le hachage de chaque fichier."""
+
+    # Defines the constructor method for the CelebIndex class.
+    def __init__(self, folder="celebs", index_path=DEFAULT_INDEX_PATH, save_every=8):
+        # Stores the celebrity folder.
+        self.folder = folder
+        # Stores the path of the index file.
+        self.index_path = index_path
+        # Initializes the entries, keyed by path relative to the folder.
+        self.entries = {}
+        # Initializes the detector settings the entries were computed with.
+        self.settings = None
+        # Stores how many entries computed on demand are kept in memory before the file is rewritten.
+        self.save_every = save_every
+        # Initializes the number of entries computed on demand and not yet written.
+        self.pending = 0
+        # Creates the lock protecting the entries and the file.
+        self._lock = threading.Lock()
+
+    # Defines the method returning the detector settings of an engine.
+    @staticmethod
+    def engine_settings(engine):
+        # Returns the model file name, the still-image detection scale and its size cap.
+        return f"{os.path.basename(engine.model_path or '')}@{engine.detection_scale}/{engine.detection_max_side}"
+
+    # Defines the method to read the index file.
+    def load(self):
+        # Sets the docstring for the method.
+        """Lit le fichier d'index ; un fichier absent, illisible ou d'une autre version donne un index vide."""
+        # Starts empty.
+        self.entries = {}
+        self.settings = None
+        # Reads the file.
+        try:
+            with np.load(self.index_path, allow_pickle=False) as data:
+                # Ignores the files written by another version.
+                if int(data["version"]) != INDEX_VERSION:
+                    return self
+                # Reads the settings and the per-image columns.
+                self.settings = str(data["settings"])
+                for i, name in enumerate(data["names"]):
+                    # Restores the "no face" entries.
+                    found = bool(data["found"][i])
+                    self.entries[str(name)] = {
+                        "mtime_ns": int(data["mtimes"][i]), "size": int(data["sizes"][i]),
+                        "sha1": str(data["hashes"][i]),
+                        "landmarks": data["landmarks"][i].astype(np.int32) if found else None}
+        # Starts from an empty index if the file is missing or broken.
+        except (OSError, KeyError, ValueError) as e:
+            if os.path.exists(self.index_path):
+                print(f"Celebrity index ignored: {str(e)}")
+            self.entries = {}
+        # Returns the index for chaining.
+        return self
+
+    # Defines the method to write the index file.
+    def save(self):
+        # Sets the docstring for the method.
+        """Écrit l'index dans un fichier .npz compact (colonnes par image, sans pickle)."""
+        # Sorts the entries by name.
+        names = sorted(self.entries)
+        count = len(names)
+        # Creates the columns (faces missing in an image are left at zero).
+        found = np.zeros(count, dtype=bool)
+        landmarks = np.zeros((count, 68, 2), dtype=np.int16)
+        # Fills the columns.
+        for i, name in enumerate(names):
+            entry = self.entries[name]
+            if entry["landmarks"] is None:
+                continue
+            found[i] = True
+            landmarks[i] = entry["landmarks"]
+        # Creates the folder of the index if needed.
+        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        # Writes to a temporary file then renames it, so a reader never sees a partial index.
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            np.savez_compressed(
+                f, version=np.int32(INDEX_VERSION), settings=np.str_(self.settings or ""),
+                names=np.array(names, dtype=np.str_),
+                mtimes=np.array([self.entries[n]["mtime_ns"] for n in names], dtype=np.int64),
+                sizes=np.array([self.entries[n]["size"] for n in names], dtype=np.int64),
+                hashes=np.array([self.entries[n]["sha1"] for n in names], dtype=np.str_),
+                found=found, landmarks=landmarks)
+        os.replace(temp_path, self.index_path)
+        # Marks every entry as written.
+        self.pending = 0
+
+    # Defines the method returning the index key of an image path.
+    def name_of(self, path):
+        # Returns the path relative to the celebrity folder (with forward slashes, so the index is portable).
+        return os.path.relpath(os.path.abspath(path), os.path.abspath(self.folder)).replace(os.sep, "/")
+
+    # Defines the method checking an entry against its file.
+    def _is_fresh(self, entry, path):
+        # Gets the date and size of the file.
+        stat = os.stat(path)
+        # Accepts the entry if the date and size did not change.
+        if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return True
+        # Accepts the entry if only the date changed (same content), and records the new date.
+        if entry["size"] == stat.st_size and entry["sha1"] == file_hash(path):
+            entry["mtime_ns"] = stat.st_mtime_ns
+            return True
+        # Rejects the entry otherwise.
+        return False
+
+    # Defines the method computing and storing the entry of one image.
+    def _index_file(self, engine, path, image=None):
+        # Reads the image if not provided.
+        if image is None:
+            image = cv2.imread(path)
+            if image is None:
+                raise ValueError(f"Invalid image file: {path}")
+        # Gets the file signature.
+        stat = os.stat(path)
+        # Computes and stores the entry.
+        entry = compute_entry(engine, image)
+        entry.update({"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha1": file_hash(path)})
+        self.entries[self.name_of(path)] = entry
+        # Returns the entry.
+        return entry
+
+    # Defines the method bringing the whole index up to date.
+    def update(self, engine, progress=None):
+        # Sets the docstring for the method.
+        """Indexe les nouvelles images de celebs/*/*.png, recalcule les modifiées et oublie les supprimées.
+
+        Retourne le nombre d'images recalculées ; le fichier n'est réécrit que si quelque chose a changé.
+        """
+        with self._lock:
+            # Drops every entry if the detector settings changed.
+            settings = self.engine_settings(engine)
+            changed = False
+            if self.settings != settings:
+                self.entries = {}
+                self.settings = settings
+                changed = True
+            # Lists the celebrity images.
+            paths = list_celebrities(self.folder)
+            names = {self.name_of(path) for path in paths}
+            # Forgets the deleted images.
+            for name in [name for name in self.entries if name not in names]:
+                del self.entries[name]
+                changed = True
+            # Computes the missing and stale entries.
+            computed = 0
+            for i, path in enumerate(paths):
+                entry = self.entries.get(self.name_of(path))
+                # Skips the fresh entries (a new date with the same content is only recorded).
+                if entry is not None:
+                    mtime_ns = entry["mtime_ns"]
+                    if self._is_fresh(entry, path):
+                        changed = changed or entry["mtime_ns"] != mtime_ns
+                        continue
+                # Reports the progress.
+                if progress is not None:
+                    progress(i, len(paths), path)
+                # Computes the entry (an unreadable image is skipped).
+                try:
+                    self._index_file(engine, path)
+                except ValueError as e:
+                    print(str(e))
+                    continue
+                computed += 1
+                changed = True
+            # Writes the index if needed.
+            if changed:
+                self.save()
+        # Returns the number of computed entries.
+        return computed
+
+    # Defines the method returning the entry of an image, computing it if needed.
+    def entry_for(self, engine, path, image=None):
+        # Sets the docstring for the method.
+        """Retourne l'entrée de path (calculée et enregistrée si elle manque ou est périmée)."""
+        with self._lock:
+            # Drops every entry if the detector settings changed.
+            settings = self.engine_settings(engine)
+            if self.settings != settings:
+                self.entries = {}
+                self.settings = settings
+            # Returns the fresh entry if available.
+            entry = self.entries.get(self.name_of(path))
+            if entry is not None and self._is_fresh(entry, path):
+                return entry
+            # Computes and stores the entry, writing the file only once every save_every new entries.
+            entry = self._index_file(engine, path, image)
+            self.pending += 1
+            if self.pending >= self.save_every:
+                self.save()
+            return entry
+
+    # Defines the method writing the entries computed on demand.
+    def flush(self):
+        # Sets the docstring for the method.
+        """Écrit l'index s'il reste des entrées calculées par entry_for et pas encore enregistrées."""
+        with self._lock:
+            if self.pending:
+                self.save()
+
+
+# Defines the disk cache of the celebrity thumbnails.
+class ThumbnailCache:
+    # Sets the docstring describing the class's purpose.
+    """Vignettes BGRA des célébrités, créées une fois puis relues depuis le disque (clé : chemin, date, taille)."""
+
+    # Defines the constructor method for the ThumbnailCache class.
+    def __init__(self, folder=DEFAULT_THUMBNAIL_FOLDER, size=112):
+        # Stores the cache folder.
+        self.folder = folder
+        # Stores the maximum side of a thumbnail (in pixels).
+        self.size = size
+
+    # Defines the method returning the cache file of an image.
+    def path_for(self, path):
+        # Gets the file signature (a modified image gets a new thumbnail).
+        stat = os.stat(path)
+        signature = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{self.size}"
+        # Returns the cache file named after the signature hash.
+        return os.path.join(self.folder, hashlib.sha1(signature.encode()).hexdigest() + ".png")
+
+    # Defines the method returning the thumbnail of an image.
+    def get(self, path):
+        # Sets the docstring for the method.
+        """Retourne la vignette BGRA de path (lue depuis le cache, ou créée et enregistrée), ou None."""
+        # Reads the cached thumbnail if available.
+        cache_path = self.path_for(path)
+        if os.path.exists(cache_path):
+            thumbnail = cv2.imread(cache_path, cv2.IMREAD_UNCHANGED)
+            if thumbnail is not None:
+                return thumbnail
+        # Reads the full image with its alpha channel.
+        image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if image is None:
+            return None
+        # Converts the image to BGRA.
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGRA)
+        elif image.shape[2] == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2BGRA)
+        # Shrinks the image to the thumbnail size (area averaging keeps it sharp).
+        h, w = image.shape[:2]
+        scale = min(self.size / w, self.size / h, 1.0)
+        thumbnail = cv2.resize(image, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        # Writes the thumbnail to the cache (to a temporary file renamed at the end).
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            temp_path = cache_path + f".{threading.get_ident()}.png"
+            cv2.imwrite(temp_path, thumbnail)
+            os.replace(temp_path, cache_path)
+        # Still returns the thumbnail if the disk is not writable.
+        except (OSError, cv2.error) as e:
+            print(f"Thumbnail cache write failed: {str(e)}")
+        # Returns the thumbnail.
+        return thumbnail
+
+
+# Defines the entry point of the indexer.
+def main(argv=None):
+    """Point d'entrée : construit ou met à jour l'index des célébrités."""
+    # Imports the argparse module for the command line options (only needed when run as a script).
+    import argparse
+    # Imports the engine here, so importing the index module stays light.
+    from face_swap_engine import FaceSwapEngine
+    # Creates the command line parser.
+    parser = argparse.ArgumentParser(description="Build the celebrity asset index")
+    parser.add_argument("--folder", default="celebs", help="celebrity folder (celebs/<name>/<name>.png)")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="index file")
+    parser.add_argument("--model", default="shape_predictor_68_face_landmarks.dat", help="Dlib 68-point model")
+    # Parses the command line.
+    args = parser.parse_args(argv)
+
+    # Creates the engine and loads the Dlib models.
+    engine = FaceSwapEngine()
+    engine.load_models(args.model)
+    # Stops if the Dlib model could not be loaded.
+    if engine.predictor is None:
+        print(f"Error: Dlib model not loaded ({args.model}).")
+        return 1
+
+    # Updates the index.
+    index = CelebIndex(args.folder, args.index).load()
+    computed = index.update(engine, progress=lambda i, n, path: print(f"[{i + 1}/{n}] {path}"))
+    # Reports the result.
+    missing = sum(1 for entry in index.entries.values() if entry["landmarks"] is None)
+    print(f"{len(index.entries)} celebrities indexed ({computed} computed, {missing} without face) -> {args.index}")
+    return 0
+
+
+# Checks if the script is being run directly (not imported as a module).
+if __name__ == "__main__":
+    # Runs the entry point and exits with its status code.
+    raise SystemExit(main())
@@ -0,0 +1,1158 @@
+# Imports the OpenCV library for image and video processing.
+import cv2
+# Imports the NumPy library for efficient array and matrix operations.
+import numpy as np
+# Imports the operating system module for file path operations.
+import os
+# Imports the threading module for the locks shared by the live stages.
+import threading
+# Imports the collections module for the lock-free free-list of live frame buffers.
+import collections
+# Imports the time module for the per-stage timing of the live mode.
+import time
+# Imports the contextlib module for the no-op timer used when statistics are disabled.
+import contextlib
+# Imports the hashlib module for the content keys of the landmark cache.
+import hashlib
+
+# Moteur de face swap sans interface : détection, landmarks, warp et blending.
+# Ce module n'importe pas Tkinter, il peut donc tourner sur une machine sans écran.
+
+# Holds the Dlib module, imported on first use (it is the slowest import and only needed once models load).
+dlib = None
+
+
+# Defines the function importing Dlib on first use.
+def load_dlib():
+    """Importe Dlib au premier usage et le retourne."""
+    # Uses the module-level reference.
+    global dlib
+    # Imports the Dlib library for face detection and landmark prediction.
+    if dlib is None:
+        import dlib as dlib_module
+        dlib = dlib_module
+    # Returns the module.
+    return dlib
+
+
+# Defines a pool of working buffers reused from one live frame to the next.
+class FrameBufferPool:
+    # Sets the docstring describing the class's purpose.
+    """Réserve de tampons de travail du mode Live, réutilisés en place d'une image à l'autre.
+
+    growths compte seulement les tampons que le pool a dû créer ou agrandir (croissance du pool), pas les
+    allocations faites hors du pool : une valeur stable montre que les tampons sont réutilisés, rien de plus.
+    """
+
+    # Defines the constructor method for the FrameBufferPool class.
+    def __init__(self):
+        # Stores the flat backing buffer of every named working buffer (arrays only).
+        self._buffers = {}
+        # Stores the next index of every pair of alternating buffers.
+        self._alternates = {}
+        # Stores the free captured-frame buffers (deque append/pop are thread-safe).
+        self._free_frames = collections.deque()
+        # Protects the growth counters, which are updated from several stages.
+        self._lock = threading.Lock()
+        # Counts every buffer the pool had to create or enlarge.
+        self.growths = 0
+        # Counts the frames processed since the pool was created.
+        self.frames = 0
+        # Stores the pool growth counted during the last frame.
+        self.last_frame_growth = 0
+        # Stores the growth count at the end of the previous frame.
+        self._growths_at_frame_start = 0
+
+    # Defines the method to record that the pool created or enlarged a buffer.
+    def count_growth(self):
+        # Increments the counter under the lock.
+        with self._lock:
+            self.growths += 1
+
+    # Defines the method to get a named working buffer of a given shape.
+    def get(self, name, shape, dtype=np.uint8):
+        # Sets the docstring for the method.
+        """Retourne un tampon contigu de forme shape, alloué seulement s'il doit grandir."""
+        # Calculates the number of elements needed.
+        size = int(np.prod(shape))
+        # Gets the current backing buffer.
+        backing = self._buffers.get(name)
+        # Grows (or creates) the backing buffer if it is too small or of another type.
+        if backing is None or backing.size < size or backing.dtype != dtype:
+            backing = np.empty(size, dtype=dtype)
+            self._buffers[name] = backing
+            self.count_growth()
+        # Returns a contiguous view of the requested shape (no data is allocated).
+        return backing[:size].reshape(shape)
+
+    # Defines the method to get one of two alternating buffers (e.g. current/previous grayscale frame).
+    def get_alternate(self, name, shape, dtype=np.uint8):
+        # Gets the index of the buffer to use this time.
+        index = self._alternates.get(name, 0)
+        # Flips the index for the next call.
+        self._alternates[name] = 1 - index
+        # Returns the selected buffer.
+        return self.get(f"{name}_{index}", shape, dtype)
+
+    # Defines the method to pre-size a buffer before the live loop starts.
+    def reserve(self, name, shape, dtype=np.uint8):
+        # Allocates the buffer at its maximum size once.
+        self.get(name, shape, dtype)
+
+    # Defines the method to get a buffer for a captured frame.
+    def acquire_frame(self, shape):
+        # Reuses a free frame buffer if one is available.
+        try:
+            return self._free_frames.pop()
+        # Allocates a new frame buffer otherwise.
+        except IndexError:
+            self.count_growth()
+            return np.empty(shape, dtype=np.uint8)
+
+    # Defines the method to give a captured frame buffer back to the pool.
+    def release_frame(self, frame):
+        # Stores the buffer for the next capture.
+        if frame is not None:
+            self._free_frames.append(frame)
+
+    # Defines the method to close the accounting of one frame.
+    def end_frame(self):
+        # Updates the counters under the lock.
+        with self._lock:
+            # Counts the frame.
+            self.frames += 1
+            # Stores the pool growth of this frame.
+            self.last_frame_growth = self.growths - self._growths_at_frame_start
+            # Starts the accounting of the next frame.
+            self._growths_at_frame_start = self.growths
+
+    # Defines the method returning the average pool growth per frame.
+    def growth_per_frame(self):
+        # Returns 0 before the first frame.
+        if self.frames == 0:
+            return 0.0
+        # Returns the average over all frames (including the warm-up).
+        return self.growths / self.frames
+
+
+# Defines the per-stage timing statistics of the live mode.
+class LiveStats:
+    # Sets the docstring describing the class's purpose.
+    """Chronométrage par étape du mode Live : FPS glissant et latences p50/p95 (en ms)."""
+
+    # Lists the timed stages in pipeline order.
+    STAGES = ("capture", "detection", "landmarks", "affine", "warp", "mask", "color", "blend", "display", "write")
+
+    # Defines the constructor method for the LiveStats class.
+    def __init__(self, window=120, enabled=True):
+        # Stores whether timings are recorded (a disabled instance costs nothing).
+        self.enabled = enabled
+        # Stores the number of samples kept per stage for the rolling statistics.
+        self.window = window
+        # Stores the recent durations (in seconds) of every stage.
+        self._samples = {stage: collections.deque(maxlen=window) for stage in self.STAGES} if enabled else {}
+        # Stores the recent display timestamps for the rolling FPS.
+        self._frame_times = collections.deque(maxlen=window)
+        # Protects the samples, which are written by several stages and read by the HUD.
+        self._lock = threading.Lock()
+
+    # Defines the method to record one duration for a stage.
+    def add(self, stage, seconds):
+        # Ignores the sample if statistics are disabled.
+        if not self.enabled:
+            return
+        # Stores the sample under the lock.
+        with self._lock:
+            self._samples[stage].append(seconds)
+
+    # Defines a context manager timing the enclosed block for a stage.
+    @contextlib.contextmanager
+    def _timer(self, stage):
+        # Stores the start time.
+        start = time.perf_counter()
+        # Runs the timed block.
+        try:
+            yield
+        # Records the duration even if the block returns early or raises.
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    # Defines the method returning a timer for a stage.
+    def time(self, stage):
+        # Returns a no-op context if statistics are disabled.
+        if not self.enabled:
+            return contextlib.nullcontext()
+        # Returns the timing context.
+        return self._timer(stage)
+
+    # Defines the method to record that a frame reached the screen.
+    def frame_shown(self):
+        # Stores the display timestamp if statistics are enabled.
+        if self.enabled:
+            with self._lock:
+                self._frame_times.append(time.perf_counter())
+
+    # Defines the method returning the rolling FPS.
+    def fps(self):
+        # Copies the timestamps under the lock.
+        with self._lock:
+            frame_times = list(self._frame_times)
+        # Returns 0 until at least two frames were shown.
+        if len(frame_times) < 2 or frame_times[-1] == frame_times[0]:
+            return 0.0
+        # Returns the number of intervals divided by the elapsed time.
+        return (len(frame_times) - 1) / (frame_times[-1] - frame_times[0])
+
+    # Defines the method returning all statistics as a dictionary (for logging).
+    def snapshot(self):
+        # Sets the docstring for the method.
+        """Retourne {"fps": ..., "stages": {étape: {"p50": ms, "p95": ms, "count": n}}}."""
+        # Copies the samples under the lock.
+        with self._lock:
+            samples = {stage: list(values) for stage, values in self._samples.items()}
+        # Initializes the per-stage statistics.
+        stages = {}
+        # Calculates the percentiles of every stage that has samples.
+        for stage in self.STAGES:
+            values = samples.get(stage)
+            if values:
+                p50, p95 = np.percentile(values, [50, 95]) * 1000.0
+                stages[stage] = {"p50": float(p50), "p95": float(p95), "count": len(values)}
+        # Returns the statistics.
+        return {"fps": self.fps(), "stages": stages}
+
+    # Defines the method returning the statistics as text lines (for the HUD and the console).
+    def summary_lines(self):
+        # Takes a snapshot of the statistics.
+        snapshot = self.snapshot()
+        # Starts with the rolling FPS.
+        lines = [f"FPS {snapshot['fps']:.1f}"]
+        # Adds one line per stage with its p50/p95 latency.
+        for stage, values in snapshot["stages"].items():
+            lines.append(f"{stage:<10} p50 {values['p50']:6.2f} ms  p95 {values['p95']:6.2f} ms")
+        # Returns the lines.
+        return lines
+
+
+# Defines a face tracker that only runs the full detector every N frames.
+class LiveFaceTracker:
+    # Sets the docstring describing the class's purpose.
+    """Suit le rectangle du visage avec dlib.correlation_tracker entre deux détections complètes."""
+
+    # Defines the constructor method for the LiveFaceTracker class.
+    def __init__(self, detect_every=5, min_confidence=7.0):
+        # Stores the maximum number of tracked frames between two full detections.
+        self.detect_every = detect_every
+        # Stores the tracking confidence (peak-to-sidelobe ratio) below which the detector runs again.
+        self.min_confidence = min_confidence
+        # Initializes the correlation tracker (None until a face has been detected).
+        self.tracker = None
+        # Counts the frames tracked since the last full detection.
+        self.frames_since_detection = 0
+
+    # Defines the method to forget the tracked face.
+    def reset(self):
+        # Drops the tracker so the next frame runs a full detection.
+        self.tracker = None
+        # Resets the frame counter.
+        self.frames_since_detection = 0
+
+    # Defines the method to locate the face in a grayscale frame.
+    def locate(self, gray, detect):
+        # Sets the docstring for the method.
+        """Retourne le rectangle du visage : suivi si possible, sinon détection via detect(gray)."""
+        # Tries the cheap tracker first while the detection interval is not exhausted.
+        if self.tracker is not None and self.frames_since_detection < self.detect_every:
+            # Updates the tracker with the new frame and gets its confidence.
+            confidence = self.tracker.update(gray)
+            # Uses the tracked rectangle if the tracker is still confident.
+            if confidence >= self.min_confidence:
+                # Counts the tracked frame.
+                self.frames_since_detection += 1
+                # Converts the tracked position to an integer rectangle for the predictor.
+                position = self.tracker.get_position()
+                return load_dlib().rectangle(int(position.left()), int(position.top()),
+                                      int(position.right()), int(position.bottom()))
+        # Runs the full detector.
+        face = detect(gray)
+        # Forgets the tracker if no face is visible anymore.
+        if face is None:
+            self.reset()
+            return None
+        # Starts a new correlation tracker on the detected face.
+        self.tracker = load_dlib().correlation_tracker()
+        self.tracker.start_track(gray, face)
+        # Resets the frame counter.
+        self.frames_since_detection = 0
+        # Returns the detected rectangle.
+        return face
+
+
+# Defines a propagator that carries the 68 landmarks forward with optical flow.
+class LandmarkFlowPropagator:
+    # Sets the docstring describing the class's purpose.
+    """Propage les 68 points d'une image à la suivante (Lucas-Kanade pyramidal) entre deux appels au prédicteur."""
+
+    # Defines the constructor method for the LandmarkFlowPropagator class.
+    def __init__(self, max_error=12.0, max_fb_error=1.0, max_frames=15):
+        # Stores the maximum mean Lucas-Kanade error accepted for a propagation.
+        self.max_error = max_error
+        # Stores the maximum forward-backward distance (in pixels) accepted for any point.
+        self.max_fb_error = max_fb_error
+        # Stores the maximum number of propagated frames before the predictor runs again.
+        self.max_frames = max_frames
+        # Sets the Lucas-Kanade parameters (21x21 window, 3 pyramid levels).
+        self.lk_params = dict(winSize=(21, 21), maxLevel=3,
+                              criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+        # Initializes the previous grayscale frame.
+        self.prev_gray = None
+        # Initializes the previous landmarks as float32 (N, 1, 2) to avoid rounding drift.
+        self.prev_points = None
+        # Counts the frames propagated since the last predictor run.
+        self.frames_since_prediction = 0
+
+    # Defines the method to forget the previous landmarks.
+    def reset(self):
+        # Drops the previous frame and points.
+        self.prev_gray = None
+        self.prev_points = None
+        # Resets the frame counter.
+        self.frames_since_prediction = 0
+
+    # Defines the method to store fresh landmarks returned by the predictor.
+    def update(self, gray, landmarks):
+        # Stores the frame the landmarks belong to.
+        self.prev_gray = gray
+        # Stores the landmarks in the layout expected by calcOpticalFlowPyrLK.
+        self.prev_points = landmarks.astype(np.float32).reshape(-1, 1, 2)
+        # Resets the frame counter.
+        self.frames_since_prediction = 0
+
+    # Defines the method to propagate the previous landmarks into a new frame.
+    def propagate(self, gray):
+        # Sets the docstring for the method.
+        """Retourne les points propagés (np.int32, (68, 2)) ou None si le prédicteur doit être relancé."""
+        # Returns None if there is nothing to propagate or the propagation budget is exhausted.
+        if self.prev_points is None or self.frames_since_prediction >= self.max_frames:
+            return None
+        # Tracks the points forward into the new frame.
+        points, status, error = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, self.prev_points, None,
+                                                         **self.lk_params)
+        # Tracks the new points backward into the previous frame.
+        back_points, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self.prev_gray, points, None,
+                                                               **self.lk_params)
+        # Calculates the forward-backward distance of every point.
+        fb_error = np.linalg.norm((self.prev_points - back_points).reshape(-1, 2), axis=1)
+        # Rejects the propagation if any point was lost or fails one of the checks.
+        if (not status.all() or not back_status.all() or fb_error.max() > self.max_fb_error
+                or error.mean() > self.max_error):
+            return None
+        # Keeps the new frame and the sub-pixel points for the next propagation.
+        self.prev_gray = gray
+        self.prev_points = points
+        # Counts the propagated frame.
+        self.frames_since_prediction += 1
+        # Returns the points in the same layout as get_landmarks.
+        return np.round(points.reshape(-1, 2)).astype(np.int32)
+
+
+# Defines a cache of the landmarks of still images, keyed by image content.
+class LandmarkCache:
+    # Sets the docstring describing the class's purpose.
+    """Cache LRU des landmarks des images fixes (clé : contenu de l'image + réglages), avec stockage disque optionnel."""
+
+    # Defines the constructor method for the LandmarkCache class.
+    def __init__(self, max_entries=64, folder=None):
+        # Stores the maximum number of entries kept in memory.
+        self.max_entries = max_entries
+        # Stores the folder of the on-disk store (None = memory only).
+        self.folder = folder
+        # Initializes the in-memory entries, least recently used first.
+        self._entries = collections.OrderedDict()
+        # Creates the lock protecting the entries (swaps may run on a worker thread).
+        self._lock = threading.Lock()
+        # Initializes the hit and miss counters.
+        self.hits = 0
+        self.misses = 0
+
+    # Defines the method building the key of an image.
+    def key(self, image, settings):
+        # Sets the docstring for the method.
+        """Retourne la clé de l'image : hachage de ses pixels, de sa forme et des réglages de détection."""
+        # Hashes the pixels (a contiguous copy is only made for non-contiguous views).
+        digest = hashlib.blake2b(np.ascontiguousarray(image).data, digest_size=16)
+        # Adds the shape, the type and the detector settings to the key.
+        digest.update(repr((image.shape, image.dtype.str, settings)).encode())
+        # Returns the key as text (also used as the file name on disk).
+        return digest.hexdigest()
+
+    # Defines the method to look up an entry.
+    def get(self, key):
+        # Sets the docstring for the method.
+        """Retourne (trouvé, landmarks) ; landmarks vaut None si aucun visage n'a été détecté."""
+        # Looks up the memory first.
+        with self._lock:
+            if key in self._entries:
+                # Marks the entry as recently used.
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+        # Looks up the disk store next.
+        if self.folder is not None:
+            path = os.path.join(self.folder, key + ".npy")
+            try:
+                # Loads the landmarks (an empty array stands for "no face").
+                points = np.load(path)
+            # Executes if the entry is missing or unreadable.
+            except (OSError, ValueError):
+                pass
+            else:
+                # Restores the "no face" result and keeps the entry in memory.
+                points = points if len(points) else None
+                self._remember(key, points)
+                with self._lock:
+                    self.hits += 1
+                return True, points
+        # Counts the miss.
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    # Defines the method to store an entry.
+    def put(self, key, points):
+        # Sets the docstring for the method.
+        """Mémorise les landmarks (ou None) d'une clé, en mémoire et sur disque si activé."""
+        # Keeps the entry in memory.
+        self._remember(key, points)
+        # Writes the entry to disk if enabled.
+        if self.folder is not None:
+            try:
+                # Creates the folder if needed.
+                os.makedirs(self.folder, exist_ok=True)
+                # Writes to a temporary file then renames it, so a reader never sees a partial file.
+                path = os.path.join(self.folder, key + ".npy")
+                temp_path = path + f".{threading.get_ident()}.tmp"
+                with open(temp_path, "wb") as f:
+                    np.save(f, np.empty((0, 2), np.int32) if points is None else points)
+                os.replace(temp_path, path)
+            # Keeps the memory entry if the disk is not writable.
+            except OSError as e:
+                print(f"Landmark cache write failed: {str(e)}")
+
+    # Defines the method to keep an entry in memory.
+    def _remember(self, key, points):
+        # Adds the entry and drops the least recently used ones beyond the limit.
+        with self._lock:
+            self._entries[key] = points
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # Defines the method to empty the memory entries.
+    def clear(self):
+        # Drops all the memory entries (the disk store is kept).
+        with self._lock:
+            self._entries.clear()
+
+
+# Defines the function building the lookup table of the LAB color transfer.
+def color_transfer_lut(src_mean, src_std, tgt_mean, tgt_std, amount):
+    """Retourne la table (1, 256, 3) uint8 de la correction LAB : (v - src_mean) / src_std * std + mean, par canal.
+
+    Les statistiques sont interpolées de la source vers la cible selon amount (0.0 à 1.0) ;
+    chaque valeur suit exactement les opérations du calcul flottant sur toute l'image (normalisation en float32,
+    puis écart-type et moyenne en float64), écrêtée à 0-255 et tronquée : les deux backends donnent la même image.
+    """
+    # Flattens the statistics and prevents division by zero.
+    src_mean = np.asarray(src_mean, dtype=np.float64).reshape(3)
+    src_std = np.asarray(src_std, dtype=np.float64).reshape(3).copy()
+    src_std[src_std == 0] = 1.0
+    # Blends the source and target statistics based on the amount.
+    std = (1 - amount) * src_std + amount * np.asarray(tgt_std, dtype=np.float64).reshape(3)
+    mean = (1 - amount) * src_mean + amount * np.asarray(tgt_mean, dtype=np.float64).reshape(3)
+    # Normalizes every possible 8-bit value of each channel in float32, as the float backend does in place.
+    table = np.repeat(np.arange(256, dtype=np.float32)[:, np.newaxis], 3, axis=1)
+    table -= src_mean
+    table /= src_std
+    # Applies the blended statistics (in float64, like the float backend).
+    table = table * std + mean
+    # Clamps and truncates like the float path, and returns the table in cv2.LUT layout.
+    return np.clip(table, 0, 255).astype(np.uint8).reshape(1, 256, 3)
+
+
+# Defines the fixed-point blending function (uint8/uint16 only, no float temporaries).
+def blend_fixed_point(src, dst, alpha, out=None, pool=None):
+    """Mélange src et dst avec un alpha 8 bits à 1 canal : (src * a + dst * (255 - a)) / 255, arrondi."""
+    # Uses a throwaway pool (plain allocations) when no pool is provided.
+    if pool is None:
+        pool = FrameBufferPool()
+    # Widens the single-channel alpha to uint16 and adds a channel axis for broadcasting.
+    a = pool.get("blend_alpha", alpha.shape, np.uint16)
+    np.copyto(a, alpha)
+    a = a[..., np.newaxis]
+    # Calculates the complementary alpha (255 - a).
+    inv_a = pool.get("blend_inv_alpha", a.shape, np.uint16)
+    np.subtract(255, a, out=inv_a)
+    # Calculates the source contribution in uint16 (at most 255 * 255).
+    acc = pool.get("blend_acc", src.shape, np.uint16)
+    np.copyto(acc, src)
+    acc *= a
+    # Calculates the target contribution in uint16 and accumulates it.
+    tmp = pool.get("blend_tmp", dst.shape, np.uint16)
+    np.copyto(tmp, dst)
+    tmp *= inv_a
+    acc += tmp
+    # Divides by 255 with rounding: (v + 128 + ((v + 128) >> 8)) >> 8 is exact for v <= 255 * 255.
+    acc += 128
+    np.right_shift(acc, 8, out=tmp)
+    acc += tmp
+    acc >>= 8
+    # Allocates the output if none was provided.
+    if out is None:
+        out = np.empty_like(dst)
+    # Narrows the result back to uint8.
+    np.copyto(out, acc, casting='unsafe')
+    # Returns the blended image.
+    return out
+
+
+# Defines the function returning the number of pyramid levels an image can hold.
+def pyramid_depth(shape, levels):
+    """Retourne levels, réduit pour que le niveau le plus grossier garde au moins 1 pixel de côté."""
+    # Halves the smallest side once per level.
+    return max(0, min(levels, int(np.log2(max(1, min(shape[:2]))))))
+
+
+# Defines the function building a Gaussian pyramid (float32).
+def gaussian_pyramid(image, levels, pool=None, name="gaussian"):
+    """Retourne [image, image/2, ...] en float32 (levels réductions, plafonné par pyramid_depth)."""
+    # Uses a throwaway pool (plain allocations) when no pool is provided.
+    if pool is None:
+        pool = FrameBufferPool()
+    # Converts the full-resolution level to float32.
+    current = pool.get(f"{name}_0", image.shape, np.float32)
+    np.copyto(current, image, casting='unsafe')
+    pyramid = [current]
+    # Blurs and halves each level (all channels at once).
+    for level in range(1, pyramid_depth(image.shape, levels) + 1):
+        shape = ((current.shape[0] + 1) // 2, (current.shape[1] + 1) // 2) + current.shape[2:]
+        current = cv2.pyrDown(current, dst=pool.get(f"{name}_{level}", shape, np.float32))
+        pyramid.append(current)
+    # Returns the pyramid.
+    return pyramid
+
+
+# Defines the function building a Laplacian pyramid (float32).
+def laplacian_pyramid(image, levels, pool=None, name="laplacian"):
+    """Retourne les bandes de détails (niveau - agrandissement du suivant) puis le résidu basse fréquence."""
+    # Uses a throwaway pool (plain allocations) when no pool is provided.
+    if pool is None:
+        pool = FrameBufferPool()
+    # Builds the Gaussian pyramid in the buffers of the bands.
+    pyramid = gaussian_pyramid(image, levels, pool, name)
+    # Subtracts the enlarged next level from each level, in place (the last level stays the residual).
+    for level in range(len(pyramid) - 1):
+        current = pyramid[level]
+        up = cv2.pyrUp(pyramid[level + 1], dst=pool.get(f"{name}_up", current.shape, np.float32),
+                       dstsize=(current.shape[1], current.shape[0]))
+        cv2.subtract(current, up, dst=current)
+    # Returns the pyramid.
+    return pyramid
+
+
+# Defines the multi-band (Laplacian pyramid) blending function.
+def blend_pyramid(src, dst, alpha=None, levels=4, amount=1.0, dst_pyramid=None, alpha_pyramid=None, out=None,
+                  pool=None):
+    """Mélange src et dst bande par bande : chaque niveau laplacien est mélangé avec l'alpha flouté au même niveau.
+
+    alpha : masque float32 à 1 canal (0.0 à 1.0), multiplié par amount. dst_pyramid / alpha_pyramid évitent de
+    reconstruire les pyramides de la cible et du masque (réutilisées entre deux réglages des sliders).
+    """
+    # Uses a throwaway pool (plain allocations) when no pool is provided.
+    if pool is None:
+        pool = FrameBufferPool()
+    # Builds the pyramids that are not provided.
+    if dst_pyramid is None:
+        dst_pyramid = laplacian_pyramid(dst, levels, pool, "pyramid_dst")
+    if alpha_pyramid is None:
+        alpha_pyramid = gaussian_pyramid(alpha, levels, pool, "pyramid_alpha")
+    src_pyramid = laplacian_pyramid(src, levels, pool, "pyramid_src")
+    # Blends each band in place in the source pyramid: s * w + d * (1 - w), with w = alpha * amount.
+    for level, (s, d, a) in enumerate(zip(src_pyramid, dst_pyramid, alpha_pyramid)):
+        weight = pool.get(f"pyramid_weight_{level}", a.shape, np.float32)
+        np.multiply(a, np.float32(amount), out=weight)
+        inverse = pool.get(f"pyramid_inverse_{level}", a.shape, np.float32)
+        np.subtract(np.float32(1.0), weight, out=inverse)
+        cv2.blendLinear(s, d, weight, inverse, dst=s)
+    # Collapses the pyramid from the coarsest level (enlarge, add the band).
+    result = src_pyramid[-1]
+    for band in reversed(src_pyramid[:-1]):
+        up = cv2.pyrUp(result, dst=pool.get("pyramid_up", band.shape, np.float32),
+                       dstsize=(band.shape[1], band.shape[0]))
+        band += up
+        result = band
+    # Allocates the output if none was provided.
+    if out is None:
+        out = np.empty_like(dst)
+    # Rounds and clamps the result back to uint8.
+    cv2.add(result, 0, dst=out, dtype=cv2.CV_8U)
+    # Returns the blended image.
+    return out
+
+
+# Defines the function preparing the tight crop of a seamless clone.
+def seamless_clone_region(hull, shape, margin=2):
+    """Retourne ((x0, y0, x1, y1), masque, centre) : boîte serrée autour du hull, masque binaire du hull dans la boîte
+    et centre à passer à cv2.seamlessClone pour que le clone reste en place (centre None si le masque est vide)."""
+    # Gets the bounding box of the hull plus a small margin, clipped to the image.
+    x, y, w, h = cv2.boundingRect(hull)
+    x0, y0 = max(x - margin, 0), max(y - margin, 0)
+    x1, y1 = min(x + w + margin, shape[1]), min(y + h + margin, shape[0])
+    # Fills the hull in crop coordinates, keeping the border of the crop empty (needed by the Poisson solver).
+    mask = np.zeros((max(y1 - y0, 0), max(x1 - x0, 0)), np.uint8)
+    cv2.fillConvexPoly(mask, (hull - [x0, y0]).astype(np.int32), 255)
+    mask[[0, -1], :] = 0
+    mask[:, [0, -1]] = 0
+    # Gets the center seamlessClone places the bounding box of the mask on (integer halves, as OpenCV does).
+    mx, my, mw, mh = cv2.boundingRect(mask)
+    center = (mx + mw // 2, my + mh // 2) if mw > 0 and mh > 0 else None
+    # Returns the region.
+    return (x0, y0, x1, y1), mask, center
+
+
+# Defines the Poisson (seamless clone) compositing function.
+def blend_seamless(src, dst, region, out=None):
+    """Colle src dans dst par cv2.seamlessClone (NORMAL_CLONE) sur la seule région de seamless_clone_region.
+
+    Seuls les pixels du masque sont écrits : le reste de out est exactement dst.
+    """
+    # Starts from the destination (in place when out is dst).
+    if out is None:
+        out = dst.copy()
+    elif out is not dst:
+        np.copyto(out, dst)
+    # Leaves the destination unchanged when the mask is empty.
+    (x0, y0, x1, y1), mask, center = region
+    if center is None:
+        return out
+    # Solves the Poisson equation on the crop only (on a copy of the mask, which seamlessClone overwrites).
+    cloned = cv2.seamlessClone(src[y0:y1, x0:x1], dst[y0:y1, x0:x1], mask.copy(), center, cv2.NORMAL_CLONE)
+    # Copies the cloned pixels inside the untouched region mask (the solver only approximates the rest of the crop).
+    cv2.copyTo(cloned, mask, out[y0:y1, x0:x1])
+    # Returns the composited image.
+    return out
+
+
+# Triangulation de Delaunay fixe des 68 landmarks dlib (calculée une fois sur une forme moyenne de visage)
+# Sets the triangles (landmark indices) of the piecewise-affine warp, shared by every face.
+FACE_TRIANGLES = np.array([
+    (0, 1, 36), (0, 17, 36), (1, 2, 41), (1, 36, 41), (2, 3, 31), (2, 31, 41), (3, 4, 48), (3, 31, 48), (4, 5, 48),
+    (5, 6, 59), (5, 48, 59), (6, 7, 59), (7, 8, 57), (7, 57, 58), (7, 58, 59), (8, 9, 57), (9, 10, 55), (9, 55, 56),
+    (9, 56, 57), (10, 11, 55), (11, 12, 54), (11, 54, 55), (12, 13, 54), (13, 14, 35), (13, 35, 54), (14, 15, 46),
+    (14, 35, 46), (15, 16, 45), (15, 45, 46), (16, 26, 45), (17, 18, 36), (18, 19, 37), (18, 36, 37), (19, 20, 23),
+    (19, 20, 38), (19, 23, 24), (19, 37, 38), (20, 21, 22), (20, 21, 38), (20, 22, 23), (21, 22, 27), (21, 27, 39),
+    (21, 38, 39), (22, 23, 43), (22, 27, 42), (22, 42, 43), (23, 24, 43), (24, 25, 44), (24, 43, 44), (25, 26, 45),
+    (25, 44, 45), (27, 28, 39), (27, 28, 42), (28, 29, 39), (28, 29, 42), (29, 30, 31), (29, 30, 35), (29, 31, 40),
+    (29, 35, 47), (29, 39, 40), (29, 42, 47), (30, 31, 32), (30, 32, 33), (30, 33, 34), (30, 34, 35), (31, 32, 49),
+    (31, 40, 41), (31, 48, 49), (32, 33, 50), (32, 49, 50), (33, 34, 52), (33, 50, 51), (33, 51, 52), (34, 35, 53),
+    (34, 52, 53), (35, 46, 47), (35, 53, 54), (36, 37, 41), (37, 38, 40), (37, 40, 41), (38, 39, 40), (42, 43, 47),
+    (43, 44, 46), (43, 46, 47), (44, 45, 46), (48, 49, 60), (48, 59, 60), (49, 50, 61), (49, 60, 67), (49, 61, 67),
+    (50, 51, 61), (51, 52, 63), (51, 61, 62), (51, 62, 63), (52, 53, 63), (53, 54, 64), (53, 63, 65), (53, 64, 65),
+    (54, 55, 64), (55, 56, 65), (55, 64, 65), (56, 57, 66), (56, 65, 66), (57, 58, 66), (58, 59, 67), (58, 66, 67),
+    (59, 60, 67), (61, 62, 67), (62, 63, 65), (62, 65, 66), (62, 66, 67)
+], dtype=np.int32)
+
+# Sets the outline of the face (jaw, then brows from right to left), the base of the outer ring of triangles.
+FACE_OUTLINE = np.array(list(range(17)) + list(range(26, 16, -1)), dtype=np.int32)
+
+# Sets how far the outer ring lies from the outline center (covers the 15 % mask expansion).
+FACE_RING_SCALE = 1.25
+
+# Sets the extra distance of the outer ring in pixels (covers the 25x25 blur of the mask, whatever the face size).
+FACE_RING_MARGIN = 16
+
+# Anneau extérieur : chaque segment du contour et son homologue agrandi forment deux triangles
+# Sets the triangles between the outline and the outer ring (ring point i has index 68 + i).
+FACE_RING_TRIANGLES = np.array(
+    [triangle for i in range(len(FACE_OUTLINE))
+     for triangle in ((FACE_OUTLINE[i], FACE_OUTLINE[(i + 1) % len(FACE_OUTLINE)], 68 + i),
+                      (FACE_OUTLINE[(i + 1) % len(FACE_OUTLINE)], 68 + (i + 1) % len(FACE_OUTLINE), 68 + i))],
+    dtype=np.int32)
+
+
+# Defines the function adding the outer ring to 68 landmarks.
+def extend_landmarks(points, ring_scale=FACE_RING_SCALE, ring_margin=FACE_RING_MARGIN):
+    """Retourne les 68 points suivis de l'anneau extérieur : le contour agrandi de ring_scale autour de son centre,
+    puis repoussé de ring_margin pixels."""
+    # Gets the outline, its center and the outward direction of each outline point.
+    points = points.reshape(-1, 2).astype(np.float64)
+    outline = points[FACE_OUTLINE]
+    center = outline.mean(axis=0)
+    offsets = outline - center
+    directions = offsets / np.maximum(np.linalg.norm(offsets, axis=1, keepdims=True), 1e-6)
+    # Appends the outline pushed away from the center.
+    return np.vstack([points, center + offsets * ring_scale + directions * ring_margin])
+
+
+# Defines the piecewise-affine warp of a source face (one affine transformation per triangle).
+class TriangleWarp:
+    # Sets the docstring describing the class's purpose.
+    """Warp affine par morceaux d'une source vers des landmarks cibles, triangle par triangle (FACE_TRIANGLES).
+
+    Un anneau de triangles autour du contour (ring_scale, 0 = aucun) couvre aussi le bord élargi et flouté du masque.
+    La partie source (découpe et sommets de chaque triangle) est calculée une fois et réutilisée à chaque image.
+    """
+
+    # Defines the constructor method for the TriangleWarp class.
+    def __init__(self, source_image, src_points, triangles=FACE_TRIANGLES, ring_scale=FACE_RING_SCALE):
+        # Stores the source image and its landmarks (the live mode reuses the warp while they are unchanged).
+        self.source_image = source_image
+        self.src_points = src_points
+        # Stores the scale of the outer ring and adds its triangles.
+        self.ring_scale = ring_scale
+        if ring_scale:
+            triangles = np.vstack([triangles, FACE_RING_TRIANGLES])
+        # Creates the pool of the per-triangle scratch buffers (used when warp() gets no pool).
+        self.pool = FrameBufferPool()
+        # Stores, per triangle, its indices and the source crop around it.
+        self.triangles = []
+        self.crops = []
+        # Stores, per triangle, the inverse of its vertex matrix in crop coordinates (maps vertices to an affine).
+        inverses = []
+        points = extend_landmarks(src_points, ring_scale) if ring_scale else src_points.astype(np.float64)
+        height, width = source_image.shape[:2]
+        for triangle in triangles:
+            src_tri = points[triangle]
+            # Skips the flat triangles (no affine transformation maps them).
+            (ax, ay), (bx, by), (cx, cy) = src_tri
+            if abs((bx - ax) * (cy - ay) - (by - ay) * (cx - ax)) < 1.0:
+                continue
+            # Gets the bounding box of the triangle plus one pixel for the bilinear interpolation, clipped.
+            x, y, w, h = cv2.boundingRect(src_tri.astype(np.float32))
+            x0, y0 = min(max(x - 1, 0), width - 1), min(max(y - 1, 0), height - 1)
+            x1, y1 = max(min(x + w + 1, width), x0 + 1), max(min(y + h + 1, height), y0 + 1)
+            self.triangles.append(triangle)
+            self.crops.append(source_image[y0:y1, x0:x1])
+            inverses.append(np.linalg.inv(np.column_stack([src_tri - [x0, y0], np.ones(3)])))
+        self.triangles = np.array(self.triangles, dtype=np.int32).reshape(-1, 3)
+        self.inverses = np.array(inverses).reshape(-1, 3, 3)
+
+    # Defines the method warping the source triangles onto the target landmarks.
+    def warp(self, dst_points, out, offset=(0, 0), pool=None):
+        # Sets the docstring for the method.
+        """Écrit chaque triangle déformé dans out (modifié en place) ; offset = origine de out dans l'image cible.
+
+        Les tampons de travail viennent de pool (celui de l'image en mode Live) ou du pool propre à l'instance.
+        """
+        # Uses the scratch buffers of the instance when no pool is provided.
+        if pool is None:
+            pool = self.pool
+        # Gets the target triangles in the coordinates of out.
+        points = extend_landmarks(dst_points, self.ring_scale) if self.ring_scale else dst_points.astype(np.float64)
+        dst = points[self.triangles] - offset
+        height, width = out.shape[:2]
+        # Gets the bounding boxes of all target triangles at once, clipped to out.
+        x0 = np.clip(np.floor(dst[..., 0].min(axis=1)), 0, width).astype(np.int32)
+        y0 = np.clip(np.floor(dst[..., 1].min(axis=1)), 0, height).astype(np.int32)
+        x1 = np.clip(np.floor(dst[..., 0].max(axis=1)) + 1, 0, width).astype(np.int32)
+        y1 = np.clip(np.floor(dst[..., 1].max(axis=1)) + 1, 0, height).astype(np.int32)
+        # Gets the target vertices relative to their bounding box.
+        dst -= np.stack([x0, y0], axis=1)[:, np.newaxis, :]
+        # Solves the affine transformations of all triangles at once (crop vertices -> box vertices).
+        matrices = np.matmul(self.inverses, dst).transpose(0, 2, 1)
+        # Gets the sub-pixel triangle outlines (4 fractional bits) for the masks.
+        outlines = np.round(dst * 16).astype(np.int32)
+        for i, crop in enumerate(self.crops):
+            w, h = x1[i] - x0[i], y1[i] - y0[i]
+            if w <= 0 or h <= 0:
+                continue
+            # Warps the source crop over the bounding box only, into a reused scratch buffer.
+            patch = cv2.warpAffine(crop, matrices[i], (int(w), int(h)),
+                                   dst=pool.get("triangle_patch", (h, w) + crop.shape[2:]), flags=cv2.INTER_LINEAR,
+                                   borderMode=cv2.BORDER_REPLICATE)
+            # Copies the pixels inside the triangle (shared edges are written by both triangles, no gaps).
+            mask = pool.get("triangle_mask", (h, w))
+            mask.fill(0)
+            cv2.fillConvexPoly(mask, outlines[i], 255, cv2.LINE_8, 4)
+            cv2.copyTo(patch, mask, out[y0[i]:y1[i], x0[i]:x1[i]])
+        # Returns the warped image.
+        return out
+
+
+# Defines the face swap engine shared by the GUI and the headless modes.
+class FaceSwapEngine:
+    # Sets the docstring describing the class's purpose.
+    """Moteur de face swap sans Tkinter : détection, points de repère et swap image par image."""
+
+    # Defines the constructor method for the FaceSwapEngine class.
+    def __init__(self):
+        # Initializes the Dlib face detector (set by load_models).
+        self.detector = None
+        # Initializes the Dlib landmark predictor (set by load_models).
+        self.predictor = None
+        # Initializes the path of the loaded landmark model (part of the landmark cache keys).
+        self.model_path = None
+        # Initializes the landmark cache of still images (None = no caching).
+        self.landmark_cache = None
+
+        # Échelle de détection (le détecteur HOG tourne sur une copie réduite)
+        # Sets the detection scale used for still images (1.0 = full resolution).
+        self.detection_scale = 1.0
+        # Sets the largest image side the still-image detector runs on (large photos are detected downscaled).
+        self.detection_max_side = 1280
+        # Sets the padding (in pixels) added to the expanded target hull for the still region of interest (> blur radius).
+        self.still_roi_padding = 16
+        # Sets the largest side kept in memory for loaded still images (None = full resolution).
+        self.working_max_side = 2048
+        # Sets the source resolution kept above what the target face needs (1.25 = 25 % margin).
+        self.source_resolution_margin = 1.25
+        # Sets the detection scale used for live frames (0.5 = half resolution).
+        self.live_detection_scale = 0.5
+        # Sets how many live frames may be tracked between two full detections (1 = detect every frame).
+        self.live_detect_every = 5
+        # Sets the tracking confidence below which a full detection is forced.
+        self.live_tracking_min_confidence = 7.0
+        # Enables optical-flow propagation of the live landmarks between predictor runs.
+        self.live_landmark_flow = True
+        # Sets the maximum forward-backward error (in pixels) accepted for propagated landmarks.
+        self.live_flow_max_fb_error = 1.0
+        # Sets the padding (in pixels) around the target hull for the live region of interest (>= blur radius).
+        self.live_roi_padding = 16
+        # Sets the amount of LAB color transfer applied in live mode (0.0 = off).
+        self.live_color_amount = 0.0
+
+        # Correction des couleurs : "lut" (tables 8 bits par canal) ou "float" (calcul float32 sur l'image)
+        # Sets the color transfer backend used by the still mode.
+        self.color_backend = "lut"
+
+        # Moteur de blending : "fixed" (uint8/uint16, alpha 8 bits), "float" (float32, masque 3 canaux)
+        # ou "pyramid" (multi-bande, pyramides laplaciennes limitées au ROI)
+        # ou "poisson" (cv2.seamlessClone sur une boîte serrée autour du hull)
+        # Sets the blending backend used by the still and live modes.
+        self.blend_backend = "fixed"
+        # Sets the number of pyramid levels of the multi-band blend.
+        self.pyramid_levels = 4
+        # Sets the time budget (in ms) of one live swap; the seamless clone only runs while it fits in it.
+        self.live_frame_budget_ms = 33.0
+        # Initializes the measured cost of the live seamless clone (ms per 1000 mask-box pixels, None until measured).
+        self.live_clone_cost = None
+
+        # Déformation de la source : "similarity" (une similitude globale) ou "triangles" (affine par triangle)
+        # Sets the warping backend used by the still and live modes.
+        self.warp_backend = "similarity"
+        # Initializes the triangle warp of the live source (rebuilt when the source changes).
+        self.live_triangle_warp = None
+
+    # Defines the method to create the per-session state of the live tracking.
+    def create_live_trackers(self):
+        # Sets the docstring for the method.
+        """Retourne (tracker, flow) pour une nouvelle séquence d'images, selon les réglages live_*."""
+        # Creates the face tracker unless detection runs on every frame.
+        tracker = None
+        if self.live_detect_every > 1:
+            tracker = LiveFaceTracker(self.live_detect_every, self.live_tracking_min_confidence)
+        # Creates the landmark propagator if enabled.
+        flow = None
+        if self.live_landmark_flow:
+            flow = LandmarkFlowPropagator(max_fb_error=self.live_flow_max_fb_error)
+        # Returns both objects.
+        return tracker, flow
+
+    # --- Dlib et Modèles ---
+    # Defines the method to load Dlib models.
+    def load_models(self, model_path="shape_predictor_68_face_landmarks.dat", progress=None):
+        # Sets the docstring for the method.
+        """Charge le détecteur de visage Dlib et le prédicteur de points de repère (progress(message) optionnel)."""
+        # Starts a try block to handle model loading errors.
+        try:
+            # Reports the first step.
+            if progress is not None:
+                progress("Loading face detector...")
+            # Initializes Dlib's frontal face detector.
+            self.detector = load_dlib().get_frontal_face_detector()
+            # Checks if the model file exists (though the next line might fail if it doesn't).
+            if not os.path.exists(model_path):
+                # Passes silently if the model file is not found (assuming it might be loaded later or handled by the next exception).
+                pass
+            # Reports the second (longest) step.
+            if progress is not None:
+                progress(f"Loading landmark model ({os.path.basename(model_path)})...")
+            # Initializes Dlib's shape predictor with the 68-point model.
+            self.predictor = load_dlib().shape_predictor(model_path)
+            # Stores the model path.
+            self.model_path = model_path
+        # Catches any exception during model loading.
+        except Exception as e:
+            # If loading fails, sets the predictor to None.
+            self.predictor = None
+
+    # Defines the method to get 68 facial landmarks.
+    def get_landmarks(self, image, detection_scale=None, tracker=None, flow=None, pool=None, stats=None):
+        # Sets the docstring for the method.
+        """Détecte les visages et retourne les 68 points de repère."""
+        # Uses disabled statistics when none are provided.
+        if stats is None:
+            stats = LiveStats(enabled=False)
+        # Converts the image to grayscale, which is required by Dlib's detector.
+        # In live mode, two pooled buffers alternate so the previous frame stays valid for the optical flow.
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY,
+                            dst=None if pool is None else pool.get_alternate("gray", image.shape[:2]))
+        # Checks if landmark propagation is available (live mode).
+        if flow is not None:
+            # Carries the previous landmarks forward with optical flow.
+            with stats.time("landmarks"):
+                points = flow.propagate(gray)
+            # Returns the propagated landmarks if they passed the error checks.
+            if points is not None:
+                return points
+        # Times the face detection (or tracking).
+        with stats.time("detection"):
+            # Checks if a tracker is available (live mode).
+            if tracker is not None:
+                # Tracks the face, running the detector only when the tracker asks for it.
+                face = tracker.locate(gray, lambda g: self.detect_face(g, detection_scale, pool))
+            # Executes for single images.
+            else:
+                # Detects the first face (possibly on a downscaled copy).
+                face = self.detect_face(gray, detection_scale, pool)
+        # Returns None if no faces are detected.
+        if face is None:
+            # Forgets the propagated landmarks as the face is gone.
+            if flow is not None:
+                flow.reset()
+            return None
+        # Times the landmark prediction.
+        with stats.time("landmarks"):
+            # Gets the 68 landmarks for the detected face at full resolution.
+            shape = self.predictor(gray, face)
+            # Converts the Dlib shape object into a NumPy array of (x, y) coordinates.
+            landmarks = np.array([(p.x, p.y) for p in shape.parts()], dtype=np.int32)
+        # Restarts the propagation from the fresh landmarks.
+        if flow is not None:
+            flow.update(gray, landmarks)
+        # Returns the landmarks.
+        return landmarks
+
+    # Defines the method to get the landmarks of a still image through the landmark cache.
+    def get_still_landmarks(self, image, detection_scale=None):
+        # Sets the docstring for the method.
+        """Retourne les 68 points de repère d'une image fixe, sans détection si l'image est déjà en cache."""
+        # Uses the still-image detection scale (reduced for large photos) unless overridden.
+        if detection_scale is None:
+            detection_scale = self.still_detection_scale(image)
+        # Runs the detection directly when caching is disabled.
+        if self.landmark_cache is None:
+            return self.get_landmarks(image, detection_scale)
+        # Builds the key from the image content and the detector settings.
+        key = self._still_key(image, detection_scale)
+        # Returns the cached landmarks if available.
+        found, points = self.landmark_cache.get(key)
+        if found:
+            return points
+        # Detects the landmarks and stores them (including "no face").
+        points = self.get_landmarks(image, detection_scale)
+        self.landmark_cache.put(key, points)
+        # Returns the landmarks.
+        return points
+
+    # Defines the method to store known landmarks of a still image (e.g. from the celebrity index).
+    def remember_still_landmarks(self, image, points, detection_scale=None):
+        # Sets the docstring for the method.
+        """Ajoute au cache les landmarks déjà connus d'une image, pour que get_still_landmarks n'ait rien à détecter."""
+        # Stores the landmarks if caching is enabled.
+        if self.landmark_cache is not None:
+            self.landmark_cache.put(self._still_key(image, detection_scale), points)
+
+    # Defines the method returning the detection scale of a still image.
+    def still_detection_scale(self, image):
+        # Sets the docstring for the method.
+        """Retourne detection_scale, réduit pour que le détecteur ne voie pas plus de detection_max_side pixels de côté."""
+        # Limits the detector input size (the landmarks are still predicted at full resolution).
+        return min(self.detection_scale, self.detection_max_side / max(image.shape[:2]))
+
+    # Defines the method building the landmark cache key of a still image.
+    def _still_key(self, image, detection_scale=None):
+        # Uses the still-image detection scale (reduced for large photos) unless overridden.
+        if detection_scale is None:
+            detection_scale = self.still_detection_scale(image)
+        # Returns the key of the image content and the detector settings.
+        return self.landmark_cache.key(image, (os.path.basename(self.model_path or ""), detection_scale))
+
+    # Defines the method to detect a face on a downscaled copy of a grayscale image.
+    def detect_face(self, gray, detection_scale=None, pool=None):
+        # Sets the docstring for the method.
+        """Détecte le premier visage sur une copie réduite et retourne son rectangle à pleine résolution."""
+        # Uses the still-image detection scale unless overridden.
+        if detection_scale is None:
+            detection_scale = self.detection_scale
+        # Runs the detector directly when no downscaling is requested.
+        if detection_scale >= 1.0:
+            # Detects faces in the full-resolution grayscale image.
+            faces = self.detector(gray)
+            # Returns the first face, or None if no faces are detected.
+            return faces[0] if len(faces) > 0 else None
+        # Calculates the size of the downscaled image.
+        small_size = (int(round(gray.shape[1] * detection_scale)), int(round(gray.shape[0] * detection_scale)))
+        # Downscales the grayscale image (INTER_AREA avoids aliasing), into a pooled buffer in live mode.
+        small = cv2.resize(gray, small_size,
+                           dst=None if pool is None else pool.get("detect_small", small_size[::-1]),
+                           interpolation=cv2.INTER_AREA)
+        # Detects faces in the downscaled image.
+        faces = self.detector(small)
+        # Returns None if no faces are detected.
+        if len(faces) == 0:
+            return None
+        # Maps the first rectangle back to full-resolution coordinates.
+        face = faces[0]
+        return load_dlib().rectangle(int(face.left() / detection_scale), int(face.top() / detection_scale),
+                              int(face.right() / detection_scale), int(face.bottom() / detection_scale))
+
+    # Defines the method checking if the live seamless clone fits in the frame budget.
+    def live_clone_fits(self, region, frame_start):
+        # Sets the docstring for the method.
+        """Retourne True si le temps déjà passé sur l'image plus le coût estimé du clone tient dans live_frame_budget_ms."""
+        # Never clones an empty mask.
+        (x0, y0, x1, y1), _, center = region
+        if center is None:
+            return False
+        # Estimates the clone cost from the measured cost per pixel (the first clone is always tried).
+        estimate = 0.0 if self.live_clone_cost is None else self.live_clone_cost * (x1 - x0) * (y1 - y0) / 1000.0
+        # Compares the elapsed time plus the estimate with the budget.
+        return (time.perf_counter() - frame_start) * 1000.0 + estimate <= self.live_frame_budget_ms
+
+    # Defines the method updating the measured cost of the live seamless clone.
+    def record_live_clone_cost(self, region, seconds):
+        # Gets the cost of this clone per 1000 pixels of its crop.
+        (x0, y0, x1, y1), _, _ = region
+        cost = seconds * 1000.0 / max(1, (x1 - x0) * (y1 - y0)) * 1000.0
+        # Smooths the cost over the recent clones.
+        self.live_clone_cost = cost if self.live_clone_cost is None else 0.8 * self.live_clone_cost + 0.2 * cost
+
+    # Defines the method that handles the actual face swap logic for one frame.
+    def perform_live_swap(self, frame, source_image, src_landmarks, detection_scale=None, tracker=None, flow=None,
+                          pool=None, stats=None):
+        # Sets the docstring for the method.
+        """Effectue le swap sur une seule image (frame) pour le mode Live (la frame est modifiée en place)."""
+        # Stores the start time of the swap (the seamless clone is only used while the frame budget allows it).
+        frame_start = time.perf_counter()
+        # Uses the live detection scale unless overridden.
+        if detection_scale is None:
+            detection_scale = self.live_detection_scale
+        # Uses disabled statistics when none are provided.
+        if stats is None:
+            stats = LiveStats(enabled=False)
+        # Gets the landmarks for the face in the live video frame (the target).
+        tgt_landmarks = self.get_landmarks(frame, detection_scale, tracker, flow, pool, stats)
+
+        # Returns the original frame if no face is detected in the target.
+        if tgt_landmarks is None:
+            return frame
+
+        # Calculates the affine transformation matrix to align source to target.
+        with stats.time("affine"):
+            matrix, _ = cv2.estimateAffinePartial2D(src_landmarks.astype(np.float32),
+                                                    tgt_landmarks.astype(np.float32))
+        # Returns the original frame if the transformation could not be estimated.
+        if matrix is None:
+            return frame
+
+        # Zone d'intérêt (ROI) : boîte englobante du hull cible + marge
+        # Calculates the convex hull of the target face.
+        hull = cv2.convexHull(tgt_landmarks)
+        # Gets the bounding box of the hull.
+        x, y, w, h = cv2.boundingRect(hull)
+        # Gets the padding, which keeps the blurred mask edge inside the ROI (plus room for the coarse pyramid bands).
+        pad = self.live_roi_padding
+        if self.blend_backend == "pyramid":
+            pad += 2 ** self.pyramid_levels
+        # Calculates the padded ROI, clipped to the frame.
+        x0, y0 = max(x - pad, 0), max(y - pad, 0)
+        x1, y1 = min(x + w + pad, frame.shape[1]), min(y + h + pad, frame.shape[0])
+        # Returns the original frame if the face is entirely outside the frame.
+        if x1 <= x0 or y1 <= y0:
+            return frame
+        # Uses a throwaway pool (plain allocations) when no pool is provided.
+        if pool is None:
+            pool = FrameBufferPool()
+
+        # Shifts the transformation so the warp writes directly into ROI coordinates.
+        matrix[0, 2] -= x0
+        matrix[1, 2] -= y0
+        # Utilisation de BORDER_REPLICATE.
+        # Warps the source image onto the target position, only over the ROI, into a pooled buffer.
+        with stats.time("warp"):
+            warped_src = cv2.warpAffine(source_image, matrix, (x1 - x0, y1 - y0),
+                                        dst=pool.get("warp", (y1 - y0, x1 - x0, 3)),
+                                        borderMode=cv2.BORDER_REPLICATE)
+            # Replaces the face with the piecewise-affine warp (the similarity warp stays around it).
+            if self.warp_backend == "triangles":
+                # Triangulates the source once and reuses it while the source is unchanged.
+                warp = self.live_triangle_warp
+                if warp is None or warp.source_image is not source_image or warp.src_points is not src_landmarks:
+                    warp = self.live_triangle_warp = TriangleWarp(source_image, src_landmarks)
+                warp.warp(tgt_landmarks, warped_src, (x0, y0), pool)
+
+        # Création du masque (simple) pour le live
+        # Times the mask creation.
+        with stats.time("mask"):
+            # Takes a pooled mask buffer the size of the ROI and clears it.
+            hard_mask = pool.get("mask", (y1 - y0, x1 - x0))
+            hard_mask.fill(0)
+            # Fills the hull (in ROI coordinates) with white (255).
+            cv2.fillConvexPoly(hard_mask, (hull - [x0, y0]).astype(np.int32), 255)
+            # Applies a small Gaussian blur for a basic blend, into a second pooled buffer.
+            mask = cv2.GaussianBlur(hard_mask, (15, 15), 0, dst=pool.get("mask_blur", hard_mask.shape))
+
+        # Gets a view on the ROI of the frame.
+        roi = frame[y0:y1, x0:x1]
+        # Correction des couleurs (optionnelle) : statistiques LAB du visage dans le ROI, puis tables par canal
+        if self.live_color_amount > 0:
+            # Times the color transfer.
+            with stats.time("color"):
+                # Converts the warped source and the frame ROI to LAB.
+                src_lab = cv2.cvtColor(warped_src, cv2.COLOR_BGR2LAB, dst=pool.get("lab", warped_src.shape))
+                roi_lab = cv2.cvtColor(roi, cv2.COLOR_BGR2LAB, dst=pool.get("roi_lab", roi.shape))
+                # Calculates the statistics of both faces inside the hull.
+                src_mean, src_std = cv2.meanStdDev(src_lab, mask=hard_mask)
+                tgt_mean, tgt_std = cv2.meanStdDev(roi_lab, mask=hard_mask)
+                # Maps the source colors in place and converts back into the warp buffer.
+                cv2.LUT(src_lab, color_transfer_lut(src_mean, src_std, tgt_mean, tgt_std, self.live_color_amount),
+                        dst=src_lab)
+                cv2.cvtColor(src_lab, cv2.COLOR_LAB2BGR, dst=warped_src)
+
+        # Blend
+        # Times the blend.
+        with stats.time("blend"):
+            # Prepares the seamless clone crop and checks that its estimated cost fits in the frame budget.
+            region = None
+            if self.blend_backend == "poisson":
+                region = seamless_clone_region((hull - [x0, y0]).astype(np.int32), roi.shape)
+                if not self.live_clone_fits(region, frame_start):
+                    region = None
+            # Checks if the seamless clone runs on this frame.
+            if region is not None:
+                # Clones the source face into the frame in place and updates the measured cost.
+                clone_start = time.perf_counter()
+                blend_seamless(warped_src, roi, region, out=roi)
+                self.record_live_clone_cost(region, time.perf_counter() - clone_start)
+            # Checks if the fixed-point backend is selected (also the fallback of the seamless clone).
+            elif self.blend_backend in ("fixed", "poisson"):
+                # Blends with the 8-bit mask as alpha and writes the result back into the frame in place.
+                blend_fixed_point(warped_src, roi, mask, out=roi, pool=pool)
+            # Checks if the multi-band backend is selected.
+            elif self.blend_backend == "pyramid":
+                # Converts the 8-bit mask to a float alpha (0.0 to 1.0) in a pooled buffer.
+                alpha = pool.get("pyramid_mask", mask.shape, np.float32)
+                np.multiply(mask, np.float32(1 / 255), out=alpha)
+                # Blends band by band and writes the result back into the frame in place.
+                blend_pyramid(warped_src, roi, alpha, self.pyramid_levels, out=roi, pool=pool)
+            # Executes for the float backend.
+            else:
+                # Converts the 1-channel mask to a 3-channel float mask (0.0 to 1.0).
+                mask3 = cv2.merge([mask, mask, mask]) / 255.0
+                # Performs a simple weighted average blend and writes it back into the frame in place.
+                roi[:] = (warped_src.astype(np.float32) * mask3
+                          + roi.astype(np.float32) * (1 - mask3)).astype(np.uint8)
+
+        # Returns the final blended frame.
+        return frame
@@ -0,0 +1,315 @@
+# Imports the OpenCV library for image and video processing.
+import cv2
+# Imports the NumPy library for efficient array and matrix operations.
+import numpy as np
+# Imports the operating system module for file and folder paths.
+import os
+# Imports the glob module for listing images and celebrities.
+import glob
+# Imports the time module for pacing the frames at a fixed rate.
+import time
+# Imports the abc module for the abstract base class of the generated sources.
+from abc import ABC, abstractmethod
+# Imports the fixed-point blending function used to composite the synthetic face.
+from face_swap_engine import FrameBufferPool, blend_fixed_point
+
+# Sources d'images du mode Live : webcam, fichier vidéo, dossier d'images ou générateur synthétique.
+# Toutes exposent la même interface que cv2.VideoCapture (isOpened, read, get, set, release),
+# le pipeline Live et le mode vidéo fonctionnent donc sans modification sur chacune d'elles.
+
+# Lists the image extensions read by ImageDirectorySource.
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+# Defines a helper that delivers frames at a fixed rate.
+class FramePacer:
+    # Sets the docstring describing the class's purpose.
+    """Attend le temps nécessaire pour livrer les images à une cadence fixe (fps <= 0 : pas d'attente)."""
+
+    # Defines the constructor method for the FramePacer class.
+    def __init__(self, fps):
+        # Stores the target frame rate.
+        self.fps = fps
+        # Initializes the time at which the next frame is due.
+        self._next_time = None
+
+    # Defines the method to wait until the next frame is due.
+    def wait(self):
+        # Returns immediately if pacing is disabled.
+        if self.fps <= 0:
+            return
+        # Gets the current time.
+        now = time.perf_counter()
+        # Starts the schedule on the first frame.
+        if self._next_time is None:
+            self._next_time = now
+        # Sleeps until the frame is due.
+        if self._next_time > now:
+            time.sleep(self._next_time - now)
+        # Schedules the next frame (never in the past, so a slow consumer does not cause a burst).
+        self._next_time = max(self._next_time, now) + 1.0 / self.fps
+
+
+# Defines the base class of the sources that are not backed by cv2.VideoCapture.
+class FrameSource(ABC):
+    # Sets the docstring describing the class's purpose.
+    """Interface commune compatible cv2.VideoCapture pour les sources d'images sans caméra (render à fournir)."""
+
+    # Defines the constructor method for the FrameSource class.
+    def __init__(self, width, height, fps, frame_count=-1, realtime=True):
+        # Stores the frame size.
+        self.width = width
+        self.height = height
+        # Stores the nominal frame rate.
+        self.fps = fps
+        # Stores the number of frames (-1 = endless).
+        self.frame_count = frame_count
+        # Stores the index of the next frame.
+        self.position = 0
+        # Creates the pacer (only when frames should be delivered in real time).
+        self.pacer = FramePacer(fps if realtime else 0)
+        # Stores whether the source is open.
+        self.opened = True
+
+    # Defines the method reporting whether the source is open.
+    def isOpened(self):
+        return self.opened
+
+    # Defines the method to render the frame at a given index (implemented by subclasses).
+    @abstractmethod
+    def render(self, index, image):
+        """Écrit l'image numéro index dans image (tableau BGR uint8 de la taille de la source, modifié en place)."""
+
+    # Defines the method to read the next frame, optionally into an existing buffer.
+    def read(self, image=None):
+        # Returns no frame if the source is closed or exhausted.
+        if not self.opened or (0 <= self.frame_count <= self.position):
+            return False, None
+        # Uses the provided buffer only if it has the right shape and type.
+        if image is None or image.shape != (self.height, self.width, 3) or image.dtype != np.uint8:
+            image = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        # Waits until the frame is due.
+        self.pacer.wait()
+        # Renders the frame into the buffer.
+        self.render(self.position, image)
+        # Moves to the next frame.
+        self.position += 1
+        # Returns the frame.
+        return True, image
+
+    # Defines the method returning a capture property.
+    def get(self, prop):
+        # Returns the property matching the cv2.VideoCapture constant.
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.frame_count)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+        # Returns 0 for unsupported properties, like OpenCV.
+        return 0.0
+
+    # Defines the method to change a capture property (only the position is supported).
+    def set(self, prop, value):
+        # Seeks to the requested frame.
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.position = int(value)
+            return True
+        # Reports unsupported properties as not set.
+        return False
+
+    # Defines the method to close the source.
+    def release(self):
+        self.opened = False
+
+
+# Defines a source reading a video file at its own frame rate.
+class VideoFileSource:
+    # Sets the docstring describing the class's purpose.
+    """Enveloppe cv2.VideoCapture pour un fichier vidéo, livré à sa cadence nominale si realtime, en boucle si loop."""
+
+    # Defines the constructor method for the VideoFileSource class.
+    def __init__(self, path, realtime=True, loop=False):
+        # Opens the video file.
+        self.capture = cv2.VideoCapture(path)
+        # Stores whether the video restarts at the end.
+        self.loop = loop
+        # Creates the pacer at the frame rate of the file (no pacing if the rate is unknown).
+        self.pacer = FramePacer(self.capture.get(cv2.CAP_PROP_FPS) if realtime else 0)
+
+    # Defines the method reporting whether the file is open.
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    # Defines the method to read the next frame, optionally into an existing buffer.
+    def read(self, image=None):
+        # Waits until the frame is due.
+        self.pacer.wait()
+        # Reads the frame.
+        ret, frame = self.capture.read(image)
+        # Rewinds to the first frame at the end of the file when looping (an empty file still ends).
+        if not ret and self.loop and self.capture.get(cv2.CAP_PROP_POS_FRAMES) > 0:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.capture.read(image)
+        # Returns the frame.
+        return ret, frame
+
+    # Defines the method returning a capture property.
+    def get(self, prop):
+        return self.capture.get(prop)
+
+    # Defines the method to change a capture property.
+    def set(self, prop, value):
+        return self.capture.set(prop, value)
+
+    # Defines the method to close the file.
+    def release(self):
+        self.capture.release()
+
+
+# Defines a source reading the images of a folder in name order.
+class ImageDirectorySource(FrameSource):
+    # Sets the docstring describing the class's purpose.
+    """Lit les images d'un dossier dans l'ordre alphabétique, à cadence fixe, en boucle si demandé."""
+
+    # Defines the constructor method for the ImageDirectorySource class.
+    def __init__(self, folder, fps=30.0, loop=False, realtime=True):
+        # Lists the images of the folder in name order.
+        self.paths = sorted(path for path in glob.glob(os.path.join(folder, "*"))
+                            if path.lower().endswith(IMAGE_EXTENSIONS))
+        # Stores whether the sequence restarts at the end.
+        self.loop = loop
+        # Reads the first image to get the frame size (every image is resized to it).
+        first = cv2.imread(self.paths[0]) if self.paths else None
+        height, width = first.shape[:2] if first is not None else (0, 0)
+        # Initializes the base source (endless when looping).
+        FrameSource.__init__(self, width, height, fps, -1 if loop else len(self.paths), realtime)
+        # Marks the source as closed if the folder holds no readable image.
+        self.opened = first is not None
+
+    # Defines the method to render the frame at a given index.
+    def render(self, index, image):
+        # Reads the image (wrapping around when looping).
+        frame = cv2.imread(self.paths[index % len(self.paths)])
+        # Copies it into the buffer, resizing it if its size differs from the first image.
+        if frame is None:
+            image.fill(0)
+        elif frame.shape == image.shape:
+            image[:] = frame
+        else:
+            cv2.resize(frame, (self.width, self.height), dst=image)
+
+
+# Defines a source animating a celebrity from celebs/ with a random but repeatable affine motion.
+class SyntheticCelebSource(FrameSource):
+    # Sets the docstring describing the class's purpose.
+    """Anime une célébrité de celebs/ (rotation, échelle, translation aléatoires mais reproductibles)."""
+
+    # Defines the constructor method for the SyntheticCelebSource class.
+    def __init__(self, celeb_path, width=1280, height=720, fps=30.0, frame_count=-1, seed=0, realtime=True):
+        # Initializes the base source.
+        FrameSource.__init__(self, width, height, fps, frame_count, realtime)
+        # Reads the celebrity with its alpha channel (the PNGs are RGBA).
+        celeb = cv2.imread(celeb_path, cv2.IMREAD_UNCHANGED)
+        # Marks the source as closed if the image cannot be read.
+        if celeb is None:
+            self.opened = False
+            return
+        # Splits the color and the alpha (an opaque alpha is used for images without one).
+        if celeb.ndim == 2:
+            celeb = cv2.cvtColor(celeb, cv2.COLOR_GRAY2BGR)
+        self.celeb = np.ascontiguousarray(celeb[..., :3])
+        self.alpha = np.ascontiguousarray(celeb[..., 3]) if celeb.shape[2] == 4 else \
+            np.full(celeb.shape[:2], 255, dtype=np.uint8)
+        # Sets the base scale so the celebrity covers about 60% of the frame height.
+        self.base_scale = 0.6 * height / celeb.shape[0]
+        # Draws the motion parameters: per axis, three sinusoids with random amplitude, frequency and phase.
+        rng = np.random.RandomState(seed)
+        # Sets the amplitudes: rotation (degrees), relative scale, x and y translation (fraction of the frame).
+        amplitudes = np.array([12.0, 0.12, 0.15, 0.08])
+        self.motion_amplitudes = amplitudes[:, None] * rng.uniform(0.3, 1.0, (4, 3)) / 3.0
+        self.motion_frequencies = rng.uniform(0.05, 0.6, (4, 3))
+        self.motion_phases = rng.uniform(0, 2 * np.pi, (4, 3))
+        # Creates the background (mid-gray with a soft vertical gradient so the frame is not flat).
+        gradient = np.linspace(90, 150, height, dtype=np.float32)[:, None, None]
+        self.background = np.broadcast_to(gradient, (height, width, 3)).astype(np.uint8)
+        # Allocates the warp buffers once.
+        self._warped = np.empty((height, width, 3), dtype=np.uint8)
+        self._warped_alpha = np.empty((height, width), dtype=np.uint8)
+        # Creates the pool of the blend temporaries (allocated on the first frame, then reused).
+        self.pool = FrameBufferPool()
+
+    # Defines the method returning the affine pose at a given frame index.
+    def pose(self, index):
+        # Sets the docstring for the method.
+        """Retourne la matrice affine 2x3 de la célébrité pour l'image index (fonction pure de l'index)."""
+        # Gets the time of the frame in seconds.
+        t = index / self.fps if self.fps > 0 else float(index)
+        # Sums the sinusoids of each axis.
+        angle, scale, tx, ty = (self.motion_amplitudes *
+                                np.sin(2 * np.pi * self.motion_frequencies * t + self.motion_phases)).sum(axis=1)
+        # Builds the rotation and scale around the center of the celebrity.
+        h, w = self.celeb.shape[:2]
+        matrix = cv2.getRotationMatrix2D((w / 2.0, h / 2.0), angle, self.base_scale * (1.0 + scale))
+        # Moves the center of the celebrity to the (moving) center of the frame.
+        matrix[0, 2] += self.width * (0.5 + tx) - w / 2.0
+        matrix[1, 2] += self.height * (0.5 + ty) - h / 2.0
+        # Returns the matrix.
+        return matrix
+
+    # Defines the method to render the frame at a given index.
+    def render(self, index, image):
+        # Gets the pose of the frame.
+        matrix = self.pose(index)
+        # Warps the celebrity and its alpha into the frame.
+        cv2.warpAffine(self.celeb, matrix, (self.width, self.height), dst=self._warped)
+        cv2.warpAffine(self.alpha, matrix, (self.width, self.height), dst=self._warped_alpha)
+        # Composites the celebrity over the background.
+        blend_fixed_point(self._warped, self.background, self._warped_alpha, out=image, pool=self.pool)
+
+
+# Defines the function that lists the celebrity images of the gallery.
+def list_celebrities(folder="celebs"):
+    # Returns the celebrity images (celebs/<name>/<name>.png) in name order.
+    return sorted(glob.glob(os.path.join(folder, "*", "*.png")))
+
+
+# Defines the function that opens a frame source from a short description.
+def open_frame_source(spec=0, realtime=True, loop=False):
+    """Ouvre une source d'images.
+
+    spec : index de webcam (0, "1"...), fichier vidéo, dossier d'images,
+    ou "synthetic[:<célébrité ou chemin>[:<nombre d'images>]]".
+    realtime : livre les images à cadence fixe ; loop : rejoue le dossier d'images ou le fichier vidéo en boucle.
+    """
+    # Opens a webcam for an integer (or digits-only) index.
+    if isinstance(spec, int) or str(spec).isdigit():
+        return cv2.VideoCapture(int(spec))
+    # Opens the synthetic generator.
+    if str(spec).startswith("synthetic"):
+        # Splits the optional celebrity and frame count.
+        parts = str(spec).split(":")
+        celeb = parts[1] if len(parts) > 1 and parts[1] else None
+        frame_count = int(parts[2]) if len(parts) > 2 and parts[2] else -1
+        # Resolves the celebrity: a path, a folder name in celebs/, or the first celebrity.
+        if celeb is None:
+            celebrities = list_celebrities()
+            celeb_path = celebrities[0] if celebrities else ""
+        elif os.path.isfile(celeb):
+            celeb_path = celeb
+        else:
+            celeb_path = os.path.join("celebs", celeb, f"{celeb}.png")
+        # Creates the generator.
+        return SyntheticCelebSource(celeb_path, frame_count=frame_count, realtime=realtime)
+    # Opens a folder of images.
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, loop=loop, realtime=realtime)
+    # Opens a video file otherwise.
+    if os.path.isfile(spec):
+        return VideoFileSource(spec, realtime=realtime, loop=loop)
+    # Opens a stream URL (or lets OpenCV report the error) otherwise.
+    return cv2.VideoCapture(spec)
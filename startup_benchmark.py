@@ -0,0 +1,185 @@
+# Imports the argparse module for the command line options.
+import argparse
+# Imports the json module for passing the measures from the child process.
+import json
+# Imports the statistics module for the median of several runs.
+import statistics
+# Imports the subprocess module for measuring each run in a fresh interpreter.
+import subprocess
+# Imports the sys module for the current interpreter path.
+import sys
+# Imports the time module for the init timings.
+import time
+# Imports the operating system module for file paths.
+import os
+
+# Banc de mesure du démarrage de swap_live_video_advance6.py : coût d'import par module et coût d'initialisation.
+# Chaque mesure tourne dans un interpréteur neuf ; la médiane de plusieurs passages est affichée.
+
+
+# Sets the module measured by the benchmark.
+APP_MODULE = "swap_live_video_advance6"
+
+# Sets the folder of the application (the child processes run from it).
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# Defines the function measuring the import cost per top-level module.
+def measure_imports(module=APP_MODULE):
+    """Importe module avec -X importtime et retourne {module importé par l'application: temps cumulé en ms}."""
+    # Runs the import in a fresh interpreter (the report is written to stderr).
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=APP_DIR, capture_output=True, text=True)
+    # Stops if the import failed.
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    # Sums the cumulative time of the modules imported directly by the application.
+    # The report lists the children before their parent, indented by two spaces per level.
+    costs = {}
+    for line in result.stderr.splitlines():
+        # Skips the header and the unrelated lines.
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # Splits "import time: self | cumulative | name".
+        own, cumulative, name = line[len("import time:"):].split("|")
+        # Gets the nesting level of the import.
+        depth = (len(name) - 1 - len(name.lstrip())) // 2
+        name = name.strip()
+        # Groups the direct imports of the application under their package.
+        if depth == 1:
+            package = name.split(".")[0]
+            costs[package] = costs.get(package, 0.0) + int(cumulative) / 1000.0
+        # Closes the breakdown at the application itself, or drops the imports of another top-level module.
+        elif depth == 0:
+            if name == module:
+                costs["(module body)"] = int(own) / 1000.0
+                costs["total"] = int(cumulative) / 1000.0
+                break
+            costs = {}
+    # Returns the costs.
+    return costs
+
+
+# Defines the function measuring the init phases (runs in the child process).
+def run_init_child(timeout=60.0):
+    """Construit FaceSwapApp, attend la première fenêtre et les modèles, et affiche les mesures en JSON."""
+    # Imports the application (its import time is measured separately).
+    start = time.perf_counter()
+    app_module = __import__(APP_MODULE)
+    timings = {"import": (time.perf_counter() - start) * 1000.0}
+
+    # Wraps the init steps of the application with timers.
+    def timed(name, method):
+        # Defines the wrapper storing the duration of the step.
+        def wrapper(*args, **kwargs):
+            step_start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                timings[name] = (time.perf_counter() - step_start) * 1000.0
+        return wrapper
+    # Replaces the init steps with their timed version.
+    for name in ("load_icons", "setup_ui", "start_model_loading"):
+        setattr(app_module.FaceSwapApp, name, timed(name, getattr(app_module.FaceSwapApp, name)))
+
+    # Creates the main window.
+    start = time.perf_counter()
+    root = app_module.Tk()
+    timings["tk_root"] = (time.perf_counter() - start) * 1000.0
+    # Creates the application.
+    start = time.perf_counter()
+    app = app_module.FaceSwapApp(root)
+    timings["app_init"] = (time.perf_counter() - start) * 1000.0
+
+    # Defines the check closing the window once the models are loaded (or failed).
+    def check():
+        # Waits while the window is not mapped or the models are still loading.
+        loading = app.model_thread is not None and app.model_thread.is_alive()
+        if (app.time_to_first_window is None or loading) and time.perf_counter() - start < timeout:
+            root.after(20, check)
+            return
+        root.destroy()
+    root.after(20, check)
+    root.mainloop()
+
+    # Adds the end-to-end metrics measured by the application itself.
+    if app.time_to_first_window is not None:
+        timings["first_window"] = app.time_to_first_window * 1000.0
+    if app.time_to_models_ready is not None:
+        timings["models_ready"] = app.time_to_models_ready * 1000.0
+    # Prints the measures for the parent process.
+    print(json.dumps(timings))
+
+
+# Defines the function measuring the init phases in a fresh interpreter.
+def measure_init():
+    """Lance run_init_child dans un interpréteur neuf et retourne ses mesures (None sans écran)."""
+    # Runs the child process.
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--child-init"],
+                            cwd=APP_DIR, capture_output=True, text=True)
+    # Returns None if the window could not be created (no display, missing dependency...).
+    if result.returncode != 0:
+        print(f"Init benchmark skipped: {result.stderr.strip().splitlines()[-1]}")
+        return None
+    # Returns the measures (the last line, after the application's own prints).
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+# Defines the function printing a table of median timings.
+def print_table(title, runs, limit=None):
+    """Affiche la médiane de chaque mesure, de la plus coûteuse à la moins coûteuse."""
+    # Computes the median of each measure over the runs.
+    names = {name for run in runs for name in run}
+    medians = {name: statistics.median(run.get(name, 0.0) for run in runs) for name in names}
+    # Prints the table.
+    print(f"\n{title} (median of {len(runs)} run(s))")
+    for name, value in sorted(medians.items(), key=lambda item: -item[1])[:limit]:
+        print(f"  {name:<24} {value:9.1f} ms")
+    # Returns the medians.
+    return medians
+
+
+# Defines the entry point of the benchmark.
+def main(argv=None):
+    """Point d'entrée : mesure le démarrage et retourne 1 si le budget est dépassé."""
+    # Creates the command line parser.
+    parser = argparse.ArgumentParser(description="Startup benchmark of swap_live_video_advance6.py")
+    parser.add_argument("--runs", type=int, default=3, help="number of fresh interpreters per measure")
+    parser.add_argument("--top", type=int, default=15, help="number of modules shown")
+    parser.add_argument("--no-init", action="store_true", help="only measure the imports (no window)")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="fails if the import (or the time to first window) exceeds this budget")
+    parser.add_argument("--child-init", action="store_true", help=argparse.SUPPRESS)
+    # Parses the command line.
+    args = parser.parse_args(argv)
+
+    # Runs the init measure of a child process.
+    if args.child_init:
+        run_init_child()
+        return 0
+
+    # Measures the imports.
+    import_runs = [measure_imports() for _ in range(args.runs)]
+    imports = print_table(f"Import cost of {APP_MODULE} per module", import_runs, args.top)
+    # Uses the total import time of the application as the startup time.
+    startup = imports.get("total", 0.0)
+
+    # Measures the init phases.
+    if not args.no_init:
+        init_runs = [run for run in (measure_init() for _ in range(args.runs)) if run is not None]
+        if init_runs:
+            init = print_table("Init cost", init_runs)
+            # Uses the time to first window as the startup time when it is available.
+            startup = init.get("first_window", startup)
+
+    # Checks the startup budget.
+    if args.budget_ms is not None and startup > args.budget_ms:
+        print(f"\nStartup budget exceeded: {startup:.1f} ms > {args.budget_ms:.1f} ms")
+        return 1
+    return 0
+
+
+# Checks if the script is being run directly (not imported as a module).
+if __name__ == "__main__":
+    # Runs the entry point and exits with its status code.
+    raise SystemExit(main())
@@ -1,29 +1,35 @@
+# Imports the time module first so the startup metric includes every import.
+import time
+# Stores the start time of the application (used for the time-to-first-window metric).
+APP_START_TIME = time.perf_counter()
 # Imports the OpenCV library for image and video processing.
 import cv2
 # Imports the NumPy library for efficient array and matrix operations.
 import numpy as np
-# Imports the Dlib library for face detection and landmark prediction.
-import dlib
 # Imports all necessary components from the Tkinter library for GUI creation.
 from tkinter import *
 # Imports specific dialog box functions from Tkinter.
 from tkinter import filedialog, messagebox, simpledialog
 # Imports image handling modules from the PIL/Pillow library.
-from PIL import Image, ImageTk, ImageDraw, ImageFont
+from PIL import Image, ImageTk
 # Imports the operating system module for file path operations.
 import os
-# Imports the urllib.request module for fetching data from URLs (e.g., AI face).
-import urllib.request
-# Imports the uuid module for generating universally unique identifiers.
-import uuid
-# Imports the smtplib module for sending emails using SMTP.
-import smtplib
-# Imports MIMEMultipart for creating email messages with multiple parts (text, image).
-from email.mime.multipart import MIMEMultipart
-# Imports MIMEImage for attaching images to email messages.
-from email.mime.image import MIMEImage
-# Imports MIMEText for attaching plain text bodies to email messages.
-from email.mime.text import MIMEText
+# NOTE: urllib.request/uuid (AI face) and smtplib/email.mime (email) are imported on first use,
+# and dlib is imported by the model loading thread, to keep them out of the startup time.
+# Imports the threading module for running the live capture and swap stages concurrently.
+import threading
+# Imports the queue module for the bounded queues between the live stages.
+import queue
+# Imports the collections module for the ordered pending jobs of the background worker.
+import collections
+# Imports the Tkinter-free face swap engine and the live mode helpers.
+from face_swap_engine import (FaceSwapEngine, FrameBufferPool, LandmarkCache, LiveStats, TriangleWarp,
+                              blend_fixed_point, blend_pyramid, blend_seamless, color_transfer_lut,
+                              gaussian_pyramid, laplacian_pyramid, seamless_clone_region)
+# Imports the frame sources (webcam, video file, image folder, synthetic generator).
+from frame_sources import open_frame_source, list_celebrities
+# Imports the precomputed celebrity index and the thumbnail cache.
+from celeb_index import CelebIndex, ThumbnailCache
 
 
 
@@ -38,26 +44,277 @@ class Separator(Frame):
         Frame.__init__(self, master, height=2, bg='#E0E0E0', **kwargs)
 
 
+# Defines a bounded queue where the most recent frame always wins.
+class LatestFrameQueue:
+    # Sets the docstring describing the class's purpose.
+    """File bornée entre deux étapes du mode Live : l'image la plus récente remplace les anciennes."""
+
+    # Defines the constructor method for the LatestFrameQueue class.
+    def __init__(self, maxsize=1):
+        # Creates the underlying thread-safe queue with a fixed capacity.
+        self._queue = queue.Queue(maxsize=maxsize)
+        # Counts how many stale items were dropped to make room for newer ones.
+        self.dropped = 0
+
+    # Defines the method to push an item without ever blocking the producer.
+    def put(self, item):
+        # Sets the docstring for the method.
+        """Ajoute item et retourne l'élément écarté (ou None) pour que son tampon puisse être recyclé."""
+        # Initializes the dropped item.
+        dropped = None
+        # Loops until the item has been stored.
+        while True:
+            # Tries to store the item immediately.
+            try:
+                self._queue.put_nowait(item)
+                return dropped
+            # Executes if the queue is full.
+            except queue.Full:
+                # Discards the oldest item so the newest one can take its place.
+                try:
+                    dropped = self._queue.get_nowait()
+                    self.dropped += 1
+                # Ignores the race where the consumer emptied the queue in the meantime.
+                except queue.Empty:
+                    pass
+
+    # Defines the method to pop the next item, returning None if nothing arrives in time.
+    def get(self, timeout=None):
+        # Waits for an item (or returns immediately when timeout is 0).
+        try:
+            if timeout == 0:
+                return self._queue.get_nowait()
+            return self._queue.get(timeout=timeout)
+        # Returns None if the queue stayed empty.
+        except queue.Empty:
+            return None
+
+
+# Defines the exception raised inside a background job that a newer request made stale.
+class JobCancelled(Exception):
+    # Sets the docstring describing the class's purpose.
+    """Levée par un calcul en arrière-plan dont le résultat ne servira plus."""
+
+
+# Defines a background worker where the most recent request of each kind always wins.
+class BackgroundJobs:
+    # Sets the docstring describing the class's purpose.
+    """Exécute les calculs lourds sur un thread ; les résultats reviennent au thread Tk par root.after.
+
+    Une nouvelle demande d'un type donné remplace celle en attente et rend périmée celle en cours.
+    """
+
+    # Defines the constructor method for the BackgroundJobs class.
+    def __init__(self, root, poll_ms=15):
+        # Stores the Tkinter root used for polling the results.
+        self.root = root
+        # Stores the polling interval (in milliseconds).
+        self.poll_ms = poll_ms
+        # Initializes the latest generation of each kind of job.
+        self._generations = {}
+        # Initializes the pending jobs, in submission order (one per kind).
+        self._pending = collections.OrderedDict()
+        # Initializes the number of submitted jobs whose result has not been handed back yet.
+        self._outstanding = 0
+        # Creates the lock protecting the pending jobs and the generations.
+        self._lock = threading.Lock()
+        # Creates the event waking up the worker thread.
+        self._wakeup = threading.Event()
+        # Creates the queue carrying the results back to the Tk thread.
+        self._results = queue.Queue()
+        # Initializes the polling state.
+        self._polling = False
+        # Initializes the running job (kind, generation).
+        self._running = None
+        # Starts the worker thread (daemon, so it never keeps the application alive).
+        threading.Thread(target=self._run, daemon=True).start()
+
+    # Defines the method to submit a job.
+    def submit(self, kind, work, on_done, on_error=None):
+        # Sets the docstring for the method.
+        """Programme work(cancelled) ; on_done(résultat) ou on_error(exception) sont appelés sur le thread Tk."""
+        # Replaces the pending job of the same kind and makes the running one stale.
+        with self._lock:
+            generation = self._generations.get(kind, 0) + 1
+            self._generations[kind] = generation
+            if kind in self._pending:
+                del self._pending[kind]
+                self._outstanding -= 1
+            self._pending[kind] = (generation, work, on_done, on_error)
+            self._outstanding += 1
+        # Wakes up the worker and starts polling the results.
+        self._wakeup.set()
+        self._schedule_poll()
+
+    # Defines the method to cancel the pending and running jobs of a kind.
+    def cancel(self, kind):
+        # Makes the running job stale and drops the pending one.
+        with self._lock:
+            self._generations[kind] = self._generations.get(kind, 0) + 1
+            if kind in self._pending:
+                del self._pending[kind]
+                self._outstanding -= 1
+
+    # Defines the method telling whether a job of a kind is still to be handed back.
+    def busy(self, kind):
+        # Checks the pending job and the running generation of the kind.
+        with self._lock:
+            return kind in self._pending or self._running == (kind, self._generations.get(kind))
+
+    # Defines the loop of the worker thread.
+    def _run(self):
+        # Loops for the lifetime of the application.
+        while True:
+            # Waits for a job.
+            self._wakeup.wait()
+            with self._lock:
+                # Goes back to sleep when nothing is pending.
+                if not self._pending:
+                    self._wakeup.clear()
+                    continue
+                # Takes the oldest pending job.
+                kind, (generation, work, on_done, on_error) = self._pending.popitem(last=False)
+                self._running = (kind, generation)
+
+            # Defines the check a job calls between its steps.
+            def cancelled(kind=kind, generation=generation):
+                return self._generations.get(kind) != generation
+            # Runs the job and queues its outcome.
+            try:
+                outcome = (True, work(cancelled))
+            except Exception as e:
+                outcome = (False, e)
+            with self._lock:
+                self._running = None
+            self._results.put((kind, generation, outcome, on_done, on_error))
+
+    # Defines the method scheduling the polling of the results.
+    def _schedule_poll(self):
+        # Starts polling unless it is already running.
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+
+    # Defines the method handing the results back (runs on the Tk thread).
+    def _poll(self):
+        # Starts a try block so the polling always goes on, whatever a callback does.
+        try:
+            # Handles every result received since the last poll.
+            while True:
+                try:
+                    kind, generation, (ok, value), on_done, on_error = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                with self._lock:
+                    self._outstanding -= 1
+                    current = self._generations.get(kind) == generation
+                # Drops the results made stale by a newer request.
+                if not current or isinstance(value, JobCancelled):
+                    continue
+                # Hands the result (or the error) to the application; a failing callback only loses its own result.
+                try:
+                    if ok:
+                        on_done(value)
+                    elif on_error is not None:
+                        on_error(value)
+                    else:
+                        print(f"Background job '{kind}' failed: {str(value)}")
+                except Exception as e:
+                    print(f"Background job '{kind}' callback failed: {str(e)}")
+        # Executes regardless of the outcome.
+        finally:
+            # Keeps polling while results are still expected.
+            with self._lock:
+                self._polling = self._outstanding > 0
+            if self._polling:
+                self.root.after(self.poll_ms, self._poll)
+
+
 # Defines the main application class for the Face Swap tool.
-class FaceSwapApp:
+class FaceSwapApp(FaceSwapEngine):
     # Defines the constructor method for the FaceSwapApp class.
     def __init__(self, root):
+        # Initializes the engine settings (detection, tracking, blending).
+        FaceSwapEngine.__init__(self)
         # Stores the root Tkinter window object.
         self.root = root
+        # Caches the landmarks of still images in memory and on disk (repeat swaps skip the detection).
+        self.landmark_cache = LandmarkCache(folder=os.path.join("cache", "landmarks"))
+        # Initializes the celebrity index (read on first use).
+        self.celeb_index = None
+        # Initializes the index entries of the celebrities picked as source and target (None for other images).
+        self.source_celeb = None
+        self.target_celeb = None
+        # Creates the disk cache of the gallery thumbnails.
+        self.thumbnail_cache = ThumbnailCache()
+        # Initializes the state of the celebrity gallery window (None while it is closed).
+        self.gallery = None
 
         # Variables de swap (stockées après le swap initial)
         # Initializes a variable to store the warped (transformed) source image (None initially).
         self.warped_src = None  # Image source déformée
         # Initializes a variable to store the face mask (None initially).
         self.mask = None  # Masque du visage float (0.0 à 1.0)
-
-        # Chargement des modèles et de l'interface
-        # Calls a method to load Dlib's models (face detector and landmark predictor).
-        self.load_models()
+        # Initializes the per-swap invariants reused by the slider updates (None until a swap is done).
+        self.swap_invariants = None
+        # Initializes the same invariants downscaled to the result display (the slider preview proxy).
+        self.preview_invariants = None
+        # Initializes the images, files and scales the swap was computed from (for the full-resolution export).
+        self.swap_origin = None
+        # Initializes the pending preview render (Tk after id).
+        self.preview_job = None
+        # Sets the minimum delay between two preview renders while dragging (about one display refresh).
+        self.preview_interval_ms = 16
+        # Creates the background worker for swaps, reloads and color updates (results polled with root.after).
+        self.jobs = BackgroundJobs(root)
+
+        # Variables du mode Live (pipeline capture -> swap -> affichage)
+        # Sets the frame source of the live mode and the webcam capture (webcam index, video, folder, "synthetic").
+        self.live_source = 0
+        # Initializes the event used to stop the live stages (None while live mode is off).
+        self.live_stop_event = None
+        # Initializes the list of live worker threads.
+        self.live_threads = []
+        # Initializes the queue feeding the display stage.
+        self.live_display_queue = None
+        # Initializes the live camera handle.
+        self.live_capture = None
+        # Initializes the pool of live working buffers (None while live mode is off).
+        self.live_pool = None
+        # Sets the initial size of the live window (the display is letterboxed into it).
+        self.live_window_size = (1280, 720)
+        # Initializes the timing statistics of the last live session (kept after closing for logging).
+        self.live_stats = None
+        # Shows the FPS/latency overlay in the live window (toggled with the H key).
+        self.live_show_hud = False
+        # Sets the polling interval (in ms) of the display stage on the Tk thread.
+        self.live_display_interval_ms = 10
+
+        # Chargement des modèles en arrière-plan
+        # Initializes the flag telling whether the Dlib models are ready.
+        self.models_ready = False
+        # Initializes the model loading thread.
+        self.model_thread = None
+        # Initializes the progress message written by the loading thread.
+        self.model_loading_message = ""
+        # Initializes the time at which the model loading started.
+        self.model_loading_start = None
+        # Initializes the time between the application start and the first window display (in seconds).
+        self.time_to_first_window = None
+        # Initializes the time between the application start and the models being ready (in seconds).
+        self.time_to_models_ready = None
+        # Stores whether the timing metrics are also printed to the console (--verbose or FACESWAP_VERBOSE=1).
+        self.verbose = os.environ.get("FACESWAP_VERBOSE", "") not in ("", "0")
+
+        # Chargement de l'interface puis des modèles
         # Calls a method to load icons for the application buttons.
         self.load_icons()
         # Calls a method to set up and configure the graphical user interface.
         self.setup_ui()
+        # Measures the time to the first window display.
+        self.root.bind("<Map>", self._on_first_map, add="+")
+        # Starts loading Dlib's models (face detector and landmark predictor) in the background.
+        self.start_model_loading()
 
         # Variables d'image et de chemins
         # Initializes the OpenCV source image object (None initially).
@@ -70,6 +327,10 @@ class FaceSwapApp:
         self.source_path = ""
         # Initializes the file path for the target image (empty string initially).
         self.target_path = ""
+        # Initializes the scale of the source image in memory relative to its file (1.0 = full resolution).
+        self.source_scale = 1.0
+        # Initializes the scale of the target image in memory relative to its file (1.0 = full resolution).
+        self.target_scale = 1.0
 
         # Sets a default width for image display in case sizing fails.
         self.display_width = 400
@@ -214,17 +475,31 @@ class FaceSwapApp:
         # Creates and grids the "Generate AI Face" button.
         self.make_button(all_buttons_frame, "Generate AI Face", self.generate_ai_face, color="#4682B4",
                          icon=self.icon_ai).grid(row=0, column=4, padx=5, pady=5)
+        # Creates and grids the "Celebrity Source" button using a lambda function.
+        self.make_button(all_buttons_frame, "Celebrity Source", lambda: self.load_celebrity(is_source=True),
+                         color="#4682B4", icon=self.icon_load).grid(row=0, column=5, padx=5, pady=5)
+        # Creates and grids the "Celebrity Target" button using a lambda function.
+        self.make_button(all_buttons_frame, "Celebrity Target", lambda: self.load_celebrity(is_source=False),
+                         color="#4682B4", icon=self.icon_load).grid(row=0, column=6, padx=5, pady=5)
+        # Creates and grids the "Celebrity Gallery" button.
+        self.make_button(all_buttons_frame, "Celebrity Gallery", self.open_celeb_gallery, color="#4682B4",
+                         icon=self.icon_load).grid(row=0, column=7, padx=5, pady=5)
 
         # Row 1: Action Buttons
-        # Creates and grids the main "Swap Faces" button.
-        self.make_button(all_buttons_frame, "Swap Faces", self.swap_faces, "#3498db", icon=self.icon_swap).grid(row=1,
-                                                                                                                column=2,
-                                                                                                                padx=5,
-                                                                                                                pady=5,
-                                                                                                                sticky="ew")
-        # Creates and grids the "Live Swap" button.
-        self.make_button(all_buttons_frame, "Live Swap", self.open_live_video, "#ff9800", icon=self.icon_swap).grid(
-            row=1, column=3, padx=5, pady=5, sticky="ew")
+        # Creates the main "Swap Faces" button and stores its reference.
+        self.swap_button = self.make_button(all_buttons_frame, "Swap Faces", self.swap_faces, "#3498db",
+                                            icon=self.icon_swap)
+        # Grids the "Swap Faces" button.
+        self.swap_button.grid(row=1, column=2, padx=5, pady=5, sticky="ew")
+        # Disables the swap button until the models are loaded.
+        self.swap_button.config(state=DISABLED)
+        # Creates the "Live Swap" button and stores its reference.
+        self.live_button = self.make_button(all_buttons_frame, "Live Swap", self.open_live_video, "#ff9800",
+                                            icon=self.icon_swap)
+        # Grids the "Live Swap" button.
+        self.live_button.grid(row=1, column=3, padx=5, pady=5, sticky="ew")
+        # Disables the live button until the models are loaded.
+        self.live_button.config(state=DISABLED)
         # Creates the "Save Result" button and stores its reference.
         self.save_button = self.make_button(all_buttons_frame, "Save Result", self.save_result, "#2ecc71",
                                             icon=self.icon_save)
@@ -274,12 +549,12 @@ class FaceSwapApp:
         self.blend_scale = Scale(blend_frame, from_=0, to=100, orient=HORIZONTAL, length=250,
                                  bg="#FFFFFF", bd=0, highlightthickness=0,
                                  troughcolor="#A9A9A9", activebackground="#4682B4",
-                                 sliderrelief=FLAT)
+                                 sliderrelief=FLAT, command=self.preview_face_swap_event)
         # Sets the default value of the blend scale to 65.
         self.blend_scale.set(65)
         # Packs the blend scale.
         self.blend_scale.pack(side=BOTTOM)
-        # Binds the mouse button release event to trigger the face swap update.
+        # Binds the mouse button release event to trigger the full-resolution face swap update.
         self.blend_scale.bind("<ButtonRelease-1>", self.update_face_swap_event)
 
         # Color Controls
@@ -294,14 +569,43 @@ class FaceSwapApp:
         self.color_scale = Scale(color_frame, from_=0, to=100, orient=HORIZONTAL, length=250,
                                  bg="#FFFFFF", bd=0, highlightthickness=0,
                                  troughcolor="#A9A9A9", activebackground="#4682B4",
-                                 sliderrelief=FLAT)
+                                 sliderrelief=FLAT, command=self.preview_face_swap_event)
         # Sets the default value of the color scale to 50.
         self.color_scale.set(50)
         # Packs the color scale.
         self.color_scale.pack(side=BOTTOM)
-        # Binds the mouse button release event to trigger the face swap update.
+        # Binds the mouse button release event to trigger the full-resolution face swap update.
         self.color_scale.bind("<ButtonRelease-1>", self.update_face_swap_event)
 
+        # Blend Mode Controls
+        # Creates a frame for the blending choice.
+        blend_mode_frame = Frame(scales_frame, bg="#FFFFFF")
+        # Packs the blend mode frame to the left.
+        blend_mode_frame.pack(side=LEFT, padx=30)
+        # Creates and packs the label for the blending choice.
+        Label(blend_mode_frame, text="Blend Mode", bg="#FFFFFF", font=("Arial", 10, "bold")).pack(side=TOP,
+                                                                                                 pady=(0, 2))
+        # Creates the variable holding the blending backend (read by the slider updates and by the live mode).
+        self.blend_mode_var = StringVar(value=self.blend_backend)
+        # Creates one radio button per backend.
+        for text, value in (("Alpha", "fixed"), ("Multi-band", "pyramid"), ("Seamless", "poisson")):
+            Radiobutton(blend_mode_frame, text=text, variable=self.blend_mode_var, value=value, bg="#FFFFFF",
+                        command=self.set_blend_backend).pack(side=LEFT)
+
+        # Warp Controls
+        # Creates a frame for the warping choice.
+        warp_frame = Frame(scales_frame, bg="#FFFFFF")
+        # Packs the warp frame to the left.
+        warp_frame.pack(side=LEFT, padx=30)
+        # Creates and packs the label for the warping choice.
+        Label(warp_frame, text="Warp", bg="#FFFFFF", font=("Arial", 10, "bold")).pack(side=TOP, pady=(0, 2))
+        # Creates the variable holding the warping backend (read by the next swap and by the live mode).
+        self.warp_var = StringVar(value=self.warp_backend)
+        # Creates one radio button per backend.
+        for text, value in (("Similarity", "similarity"), ("Triangles", "triangles")):
+            Radiobutton(warp_frame, text=text, variable=self.warp_var, value=value, bg="#FFFFFF",
+                        command=self.set_warp_backend).pack(side=LEFT)
+
         # === Status Bar ===
         # Creates a StringVar to hold the status message text.
         self.status_var = StringVar()
@@ -358,74 +662,359 @@ class FaceSwapApp:
         # Converts the darkened RGB tuple back into a hex string format.
         return '#%02x%02x%02x' % darkened_rgb
 
-    # --- Dlib et Modèles ---
-    # Defines the method to load Dlib models.
-    def load_models(self):
+    # Defines the method to start loading the Dlib models on a background thread.
+    def start_model_loading(self):
         # Sets the docstring for the method.
-        """Charge le détecteur de visage Dlib et le prédicteur de points de repère."""
-        # Starts a try block to handle model loading errors.
-        try:
-            # Initializes Dlib's frontal face detector.
-            self.detector = dlib.get_frontal_face_detector()
-            # Defines the path to the landmark prediction model file.
-            model_path = "shape_predictor_68_face_landmarks.dat"
-            # Checks if the model file exists (though the next line might fail if it doesn't).
-            if not os.path.exists(model_path):
-                # Passes silently if the model file is not found (assuming it might be loaded later or handled by the next exception).
-                pass
-            # Initializes Dlib's shape predictor with the 68-point model.
-            self.predictor = dlib.shape_predictor(model_path)
-        # Catches any exception during model loading.
-        except Exception as e:
-            # If loading fails, sets the predictor to None.
-            self.predictor = None
+        """Charge les modèles Dlib en arrière-plan ; la fenêtre reste utilisable pendant ce temps."""
+        # Stores the start time of the loading.
+        self.model_loading_start = time.perf_counter()
+        # Sets the first progress message.
+        self.model_loading_message = "Loading face models..."
+        # Creates the loading thread (it never touches Tkinter, progress is polled from the Tk thread).
+        self.model_thread = threading.Thread(
+            target=self.load_models,
+            kwargs={"progress": lambda message: setattr(self, "model_loading_message", message)},
+            daemon=True)
+        # Starts the loading thread.
+        self.model_thread.start()
+        # Schedules the first progress check.
+        self.root.after(100, self._poll_model_loading)
+
+    # Defines the method polling the model loading thread from the Tk event loop.
+    def _poll_model_loading(self):
+        # Gets the elapsed loading time.
+        elapsed = time.perf_counter() - self.model_loading_start
+        # Checks if the loading thread is still running.
+        if self.model_thread.is_alive():
+            # Shows the progress message with the elapsed time.
+            self.status_var.set(f"{self.model_loading_message} ({elapsed:.1f} s)")
+            # Schedules the next check.
+            self.root.after(100, self._poll_model_loading)
+            return
+        # Checks if the landmark model failed to load.
+        if self.predictor is None:
+            # Keeps the swap buttons disabled and reports the error.
+            self.status_var.set("Dlib model not loaded. Face swap is not possible.")
+            return
+        # Marks the models as ready.
+        self.models_ready = True
+        # Stores the time from the application start to the models being ready.
+        self.time_to_models_ready = time.perf_counter() - APP_START_TIME
+        # Enables the swap buttons.
+        self.swap_button.config(state=NORMAL)
+        self.live_button.config(state=NORMAL)
+        # Updates the status bar.
+        self.status_var.set(f"Models loaded in {elapsed:.1f} s. Ready to load images...")
+
+    # Defines the handler measuring the time to the first window display.
+    def _on_first_map(self, event):
+        # Ignores the events of the child widgets and the later map events.
+        if event.widget is not self.root or self.time_to_first_window is not None:
+            return
+        # Stores the time from the application start to the first window display.
+        self.time_to_first_window = time.perf_counter() - APP_START_TIME
+        # Prints the metric to the console when asked (startup_benchmark.py reads the attribute instead).
+        if self.verbose:
+            print(f"Time to first window: {self.time_to_first_window:.3f} s")
 
             # --- Fonctions de Chargement d'Images ---
 
     # Defines the generic method to load an image from a file dialog.
     def load_image(self, is_source=True):
         # Sets the docstring for the method.
-        """Charge une image à partir d'un fichier."""
+        """Charge une image à partir d'un fichier (lecture en arrière-plan)."""
         # Opens the file dialog, allowing selection of image files.
         path = filedialog.askopenfilename(filetypes=[("Image Files", "*.jpg *.jpeg *.png")])
         # Returns if the user cancels the dialog.
         if not path:
             return
-        # Starts a try block for image loading and processing.
-        try:
-            # Reads the image file using OpenCV.
-            image = cv2.imread(path)
-            # Raises an error if OpenCV failed to load the image (e.g., corrupted file).
-            if image is None:
-                raise ValueError("Invalid image file")
-            # Checks if the image is meant for the source display.
-            if is_source:
-                # Stores the loaded image as the source image.
-                self.source_image = image
-                # Stores the file path.
-                self.source_path = path
-                # Calls the method to display the image in the source label.
-                self.show_image(image, self.source_label)
-                # Updates the status bar.
-                self.status_var.set(f"Source image loaded: {os.path.basename(path)}")
-            # Executes if the image is meant for the target display.
-            else:
-                # Stores the loaded image as the target image.
-                self.target_image = image
-                # Stores the file path.
-                self.target_path = path
-                # Calls the method to display the image in the target label.
-                self.show_image(image, self.target_label)
-                # Updates the status bar.
-                self.status_var.set(f"Target image loaded: {os.path.basename(path)}")
-            # Checks if both source and target images are loaded.
-            if self.source_image is not None and self.target_image is not None:
-                # Updates the status bar to prompt for a swap operation.
-                self.status_var.set("Ready to perform face swap")
-        # Catches any exceptions during the loading process.
-        except Exception as e:
-            # Shows an error message.
-            messagebox.showerror("Error", f"Failed to load image: {str(e)}")
+        # Reads the image at working resolution on the background worker.
+        self.submit_image_load(is_source, path, lambda: self.read_working_image(path) + (None,),
+                               "Source image loaded" if is_source else "Target image loaded")
+
+    # Defines the method reading an image file (runs on the background worker).
+    def read_image(self, path, flags=cv2.IMREAD_COLOR):
+        # Reads the image file using OpenCV.
+        image = cv2.imread(path, flags)
+        # Raises an error if OpenCV failed to load the image (e.g., corrupted file).
+        if image is None:
+            raise ValueError("Invalid image file")
+        # Returns the image.
+        return image
+
+    # Defines the method reading an image file at working resolution (runs on the background worker).
+    def read_working_image(self, path):
+        # Sets the docstring for the method.
+        """Lit path réduit à working_max_side ; retourne (image, échelle par rapport au fichier)."""
+        # Reads the image size from the file header (no decoding).
+        with Image.open(path) as header:
+            full_side = max(header.size)
+        # Picks the largest reduced decode (1/8, 1/4, 1/2) that still keeps the working resolution.
+        flags = cv2.IMREAD_COLOR
+        if self.working_max_side is not None:
+            for factor, reduced in ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4),
+                                    (2, cv2.IMREAD_REDUCED_COLOR_2)):
+                if full_side // factor >= self.working_max_side:
+                    flags = reduced
+                    break
+        # Decodes the image (JPEG decodes directly at the reduced size).
+        image = self.read_image(path, flags)
+        # Caps the decoded image at the working resolution.
+        side = max(image.shape[:2])
+        if self.working_max_side is not None and side > self.working_max_side:
+            ratio = self.working_max_side / side
+            image = cv2.resize(image, (max(1, round(image.shape[1] * ratio)), max(1, round(image.shape[0] * ratio))),
+                               interpolation=cv2.INTER_AREA)
+        # Returns the image and its scale relative to the file.
+        return image, min(1.0, max(image.shape[:2]) / full_side)
+
+    # Defines the method loading an image on the background worker.
+    def submit_image_load(self, is_source, path, read, message):
+        # Sets the docstring for the method.
+        """Lance read() -> (image, échelle, entrée d'index) en arrière-plan, puis place l'image dans la source ou la cible."""
+        # Cancels the running swap, as the new image makes its result stale.
+        self.jobs.cancel("swap")
+        self.root.config(cursor="")
+        # Updates the status bar.
+        self.status_var.set(f"Loading {os.path.basename(path)}...")
+        # Submits the reading (a newer image for the same slot replaces it).
+        self.jobs.submit("load_source" if is_source else "load_target", lambda cancelled: read(),
+                         lambda result: self.set_loaded_image(is_source, result[0], path, result[2], message,
+                                                              result[1]),
+                         lambda e: messagebox.showerror("Error", f"Failed to load image: {str(e)}"))
+
+    # Defines the method placing a loaded image into the source or target slot (runs on the Tk thread).
+    def set_loaded_image(self, is_source, image, path, entry, message, scale=1.0):
+        # Checks if the image is meant for the source display.
+        if is_source:
+            # Stores the loaded image as the source image.
+            self.source_image = image
+            # Stores the file path.
+            self.source_path = path
+            # Stores the scale of the image relative to the file (re-read for the full-resolution export).
+            self.source_scale = scale
+            # Stores the celebrity index entry (None for other images).
+            self.source_celeb = entry
+            # Calls the method to display the image in the source label.
+            self.show_image(image, self.source_label)
+        # Executes if the image is meant for the target display.
+        else:
+            # Stores the loaded image as the target image.
+            self.target_image = image
+            # Stores the file path.
+            self.target_path = path
+            # Stores the scale of the image relative to the file (re-read for the full-resolution export).
+            self.target_scale = scale
+            # Stores the celebrity index entry (None for other images).
+            self.target_celeb = entry
+            # Calls the method to display the image in the target label.
+            self.show_image(image, self.target_label)
+        # Updates the status bar.
+        self.status_var.set(f"{message}: {os.path.basename(path)}")
+        # Checks if both source and target images are loaded.
+        if self.source_image is not None and self.target_image is not None:
+            # Updates the status bar to prompt for a swap operation.
+            self.status_var.set("Ready to perform face swap")
+
+    # Defines the method to load a celebrity from the celebs/ folder.
+    def load_celebrity(self, is_source=True):
+        # Sets the docstring for the method.
+        """Charge une célébrité de celebs/ ; ses landmarks viennent de l'index précalculé (pas de détection)."""
+        # Gets the celebrity folder.
+        celeb_folder = os.path.join(os.getcwd(), "celebs")
+        # Checks if the folder exists.
+        if not os.path.exists(celeb_folder):
+            # Shows an error if the folder is missing.
+            messagebox.showerror("Error", "Celebs folder not found! Please create a 'celebs' folder with celebrity images.")
+            return
+        # Opens the file dialog in the celebrity folder.
+        path = filedialog.askopenfilename(initialdir=celeb_folder, title="Select Celebrity Image",
+                                          filetypes=[("Image Files", "*.png")])
+        # Returns if the user cancels the dialog.
+        if not path:
+            return
+        # Loads the chosen celebrity.
+        self.set_celebrity(path, is_source)
+
+    # Defines the method to put a celebrity image into the source or target slot.
+    def set_celebrity(self, path, is_source=True):
+        # Sets the docstring for the method.
+        """Place la célébrité path dans l'emplacement source ou cible (utilisé par le dialogue et la galerie)."""
+        # Reads the celebrity and its index entry on the background worker.
+        self.submit_image_load(is_source, path, lambda: self.read_celebrity(path),
+                               "Celebrity source image loaded" if is_source else "Celebrity target image loaded")
+
+    # Defines the method reading a celebrity and its index entry (runs on the background worker).
+    def read_celebrity(self, path):
+        # Reads the image file.
+        image = self.read_image(path)
+        # Gets the precomputed entry of the celebrity (computed once if missing or stale).
+        entry = None
+        if self.models_ready:
+            # Reads the index on first use.
+            if self.celeb_index is None:
+                self.celeb_index = CelebIndex(os.path.join(os.getcwd(), "celebs")).load()
+            entry = self.celeb_index.entry_for(self, path, image)
+            # Seeds the landmark cache so the swap skips the detection.
+            self.remember_still_landmarks(image, entry["landmarks"])
+        # Returns the image (celebrities are kept at full resolution, as indexed), its scale and its entry.
+        return image, 1.0, entry
+
+    # --- Galerie des célébrités ---
+    # Defines the method to open the thumbnail gallery of the celebrities.
+    def open_celeb_gallery(self):
+        # Sets the docstring for the method.
+        """Ouvre la galerie : grille de vignettes chargées à la demande quand elles deviennent visibles."""
+        # Brings the gallery to the front if it is already open.
+        if self.gallery is not None:
+            self.gallery["window"].lift()
+            return
+        # Lists the celebrities.
+        paths = list_celebrities(os.path.join(os.getcwd(), "celebs"))
+        # Checks if there is anything to show.
+        if not paths:
+            # Shows an error if the folder is missing or empty.
+            messagebox.showerror("Error", "Celebs folder not found! Please create a 'celebs' folder with celebrity images.")
+            return
+
+        # Creates the gallery window.
+        window = Toplevel(self.root)
+        window.title("Celebrity Gallery")
+        window.geometry("760x600")
+        window.configure(bg="#36454F")
+        # Creates the bar choosing the slot fed by a click.
+        bar = Frame(window, bg="#36454F")
+        bar.pack(fill=X, padx=10, pady=5)
+        slot = StringVar(value="source")
+        Label(bar, text="Use as:", bg="#36454F", fg="white").pack(side=LEFT)
+        for text, value in (("Source", "source"), ("Target", "target")):
+            Radiobutton(bar, text=text, variable=slot, value=value, bg="#36454F", fg="white",
+                        selectcolor="#4682B4", activebackground="#36454F").pack(side=LEFT, padx=5)
+        # Creates the scrollable canvas holding the grid.
+        background = "#2C3A44"
+        canvas = Canvas(window, bg=background, highlightthickness=0)
+        scrollbar = Scrollbar(window, orient=VERTICAL)
+        scrollbar.pack(side=RIGHT, fill=Y)
+        canvas.pack(side=LEFT, fill=BOTH, expand=True)
+
+        # Sets the size of a grid cell (thumbnail and name).
+        cell_w = self.thumbnail_cache.size + 30
+        cell_h = self.thumbnail_cache.size + 40
+        columns = 5
+        # Stores the gallery state (the thumbnails are requested by the Tk thread and decoded by a worker thread).
+        self.gallery = {"window": window, "canvas": canvas, "slot": slot, "paths": paths,
+                        "columns": columns, "cell": (cell_w, cell_h), "requested": set(), "photos": {},
+                        "requests": queue.LifoQueue(), "results": queue.Queue(), "stop": threading.Event()}
+        # Draws the empty cells (canvas items stay cheap with hundreds of entries).
+        for i, path in enumerate(paths):
+            x, y = (i % columns) * cell_w, (i // columns) * cell_h
+            tag = f"cell{i}"
+            # Fills the cell so a click anywhere inside picks it (an unfilled rectangle only reacts on its outline).
+            canvas.create_rectangle(x + 6, y + 6, x + cell_w - 6, y + cell_h - 6, outline="#4a4a4a", fill=background,
+                                    tags=tag)
+            canvas.create_text(x + cell_w // 2, y + cell_h - 16, text=os.path.basename(os.path.dirname(path)),
+                               fill="white", width=cell_w - 12, font=("Arial", 8), tags=tag)
+            # Feeds the chosen slot on click.
+            canvas.tag_bind(tag, "<Button-1>", lambda event, p=path: self._gallery_pick(p))
+        # Sets the scrollable area.
+        rows = (len(paths) + columns - 1) // columns
+        canvas.configure(scrollregion=(0, 0, columns * cell_w, rows * cell_h), yscrollcommand=scrollbar.set)
+
+        # Defines the scroll handler (it requests the thumbnails that became visible).
+        def scroll(*args):
+            canvas.yview(*args)
+            self._gallery_request_visible()
+        scrollbar.config(command=scroll)
+        # Scrolls with the mouse wheel (Windows/macOS, then Linux).
+        canvas.bind("<MouseWheel>", lambda event: scroll("scroll", -1 if event.delta > 0 else 1, "units"))
+        canvas.bind("<Button-4>", lambda event: scroll("scroll", -1, "units"))
+        canvas.bind("<Button-5>", lambda event: scroll("scroll", 1, "units"))
+        # Requests the visible thumbnails when the window is shown or resized.
+        canvas.bind("<Configure>", lambda event: self._gallery_request_visible())
+        # Closes the gallery with the window.
+        window.protocol("WM_DELETE_WINDOW", self.close_celeb_gallery)
+
+        # Starts the thumbnail thread.
+        threading.Thread(target=self._gallery_thumbnail_worker,
+                         args=(self.gallery["requests"], self.gallery["results"], self.gallery["stop"]),
+                         daemon=True).start()
+        # Starts polling the decoded thumbnails.
+        self.root.after(30, self._gallery_poll)
+
+    # Defines the method requesting the thumbnails of the visible rows.
+    def _gallery_request_visible(self):
+        # Ignores late events of a closed gallery.
+        if self.gallery is None:
+            return
+        # Gets the visible rows (plus one row ahead).
+        canvas = self.gallery["canvas"]
+        cell_w, cell_h = self.gallery["cell"]
+        columns = self.gallery["columns"]
+        top = int(canvas.canvasy(0))
+        bottom = top + canvas.winfo_height()
+        first = max(0, top // cell_h) * columns
+        last = min(len(self.gallery["paths"]), (bottom // cell_h + 2) * columns)
+        # Requests the thumbnails not requested yet (the last request is served first).
+        for i in range(last - 1, first - 1, -1):
+            if i not in self.gallery["requested"]:
+                self.gallery["requested"].add(i)
+                self.gallery["requests"].put((i, self.gallery["paths"][i]))
+
+    # Defines the worker decoding the thumbnails (never touches Tkinter).
+    def _gallery_thumbnail_worker(self, requests, results, stop_event):
+        # Loops until the gallery is closed.
+        while not stop_event.is_set():
+            # Waits for a request.
+            try:
+                i, path = requests.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            # Reads (or creates) the thumbnail from the disk cache.
+            thumbnail = self.thumbnail_cache.get(path)
+            # Converts it to a PIL image (the PhotoImage is created on the Tk thread).
+            if thumbnail is not None:
+                results.put((i, Image.fromarray(cv2.cvtColor(thumbnail, cv2.COLOR_BGRA2RGBA))))
+
+    # Defines the method showing the decoded thumbnails (runs on the Tk thread).
+    def _gallery_poll(self):
+        # Stops polling once the gallery is closed.
+        if self.gallery is None:
+            return
+        # Draws every thumbnail decoded since the last poll.
+        canvas = self.gallery["canvas"]
+        cell_w, cell_h = self.gallery["cell"]
+        columns = self.gallery["columns"]
+        while True:
+            try:
+                i, image = self.gallery["results"].get_nowait()
+            except queue.Empty:
+                break
+            # Keeps a reference to the PhotoImage to prevent it from being garbage collected.
+            photo = ImageTk.PhotoImage(image)
+            self.gallery["photos"][i] = photo
+            # Centers the thumbnail in its cell.
+            x, y = (i % columns) * cell_w, (i // columns) * cell_h
+            canvas.create_image(x + cell_w // 2, y + (cell_h - 20) // 2 + 2, image=photo, tags=f"cell{i}")
+        # Schedules the next poll.
+        self.root.after(30, self._gallery_poll)
+
+    # Defines the method feeding the chosen slot with a gallery celebrity.
+    def _gallery_pick(self, path):
+        # Loads the celebrity into the slot chosen in the gallery bar.
+        self.set_celebrity(path, is_source=self.gallery["slot"].get() == "source")
+
+    # Defines the method to close the gallery.
+    def close_celeb_gallery(self):
+        # Returns if the gallery is not open.
+        if self.gallery is None:
+            return
+        # Stops the thumbnail thread and closes the window.
+        self.gallery["stop"].set()
+        self.gallery["window"].destroy()
+        self.gallery = None
+        # Writes the index entries computed while browsing.
+        if self.celeb_index is not None:
+            self.celeb_index.flush()
 
     # Defines a wrapper method for loading the source image.
     def load_source(self):
@@ -439,11 +1028,11 @@ class FaceSwapApp:
 
     # --- Webcam ---
     # Defines the method to capture a still image from the webcam.
-    def capture_from_webcam(self, is_source=True):
+    def capture_from_webcam(self, is_source=True, detection_scale=None):
         # Sets the docstring for the method.
-        """Capture une image fixe à partir de la webcam."""
-        # Opens the first available video capture device (webcam).
-        cap = cv2.VideoCapture(0)
+        """Capture une image fixe à partir de la webcam ; le visage est détecté une seule fois, sur l'image capturée."""
+        # Opens the configured frame source (the first webcam by default).
+        cap = open_frame_source(self.live_source, loop=True)
         # Checks if the camera opened successfully.
         if not cap.isOpened():
             # Shows an error message and returns if the webcam cannot be opened.
@@ -492,6 +1081,10 @@ class FaceSwapApp:
                 self.source_image = captured
                 # Assigns a temporary path name.
                 self.source_path = "webcam_source.jpg"
+                # Marks the image as full resolution (there is no file to re-read).
+                self.source_scale = 1.0
+                # Forgets the celebrity index entry of the previous image.
+                self.source_celeb = None
                 # Displays the image in the source label.
                 self.show_image(captured, self.source_label)
                 # Updates the status bar.
@@ -502,6 +1095,10 @@ class FaceSwapApp:
                 self.target_image = captured
                 # Assigns a temporary path name.
                 self.target_path = "webcam_target.jpg"
+                # Marks the image as full resolution (there is no file to re-read).
+                self.target_scale = 1.0
+                # Forgets the celebrity index entry of the previous image.
+                self.target_celeb = None
                 # Displays the image in the target label.
                 self.show_image(captured, self.target_label)
                 # Updates the status bar.
@@ -510,10 +1107,17 @@ class FaceSwapApp:
             if self.source_image is not None and self.target_image is not None:
                 # Updates the status bar.
                 self.status_var.set("Ready to perform face swap.")
+            # Detects the face once on the captured frame (cached for the swap) when the models are loaded.
+            if self.models_ready and self.get_still_landmarks(captured, detection_scale) is None:
+                # Warns right away instead of at swap time.
+                self.status_var.set("No face detected in the webcam capture.")
 
     # --- IA Face Generator ---
     # Defines the method to download an AI-generated face.
     def generate_ai_face(self):
+        # Imports the download modules on first use (rarely clicked, kept out of the startup).
+        import urllib.request
+        import uuid
         try:
             self.status_var.set("Downloading AI face...")
             self.root.config(cursor="watch")
@@ -534,6 +1138,8 @@ class FaceSwapApp:
 
             self.source_image = image
             self.source_path = filepath
+            self.source_scale = 1.0
+            self.source_celeb = None
             self.show_image(image, self.source_label)
             self.status_var.set("AI face loaded.")
 
@@ -546,22 +1152,6 @@ class FaceSwapApp:
             self.root.config(cursor="")
 
     # --- Fonctions de Traitement (Dlib et OpenCV) ---
-    # Defines the method to get 68 facial landmarks.
-    def get_landmarks(self, image):
-        # Sets the docstring for the method.
-        """Détecte les visages et retourne les 68 points de repère."""
-        # Converts the image to grayscale, which is required by Dlib's detector.
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        # Detects faces in the grayscale image.
-        faces = self.detector(gray)
-        # Returns None if no faces are detected.
-        if len(faces) == 0:
-            return None
-        # Gets the 68 landmarks for the first detected face.
-        shape = self.predictor(gray, faces[0])
-        # Converts the Dlib shape object into a NumPy array of (x, y) coordinates.
-        return np.array([(p.x, p.y) for p in shape.parts()], dtype=np.int32)
-
     # Defines the method to create a soft, expanded mask around the face.
     def create_mask(self, landmarks, shape):
         # Sets the docstring for the method.
@@ -607,53 +1197,84 @@ class FaceSwapApp:
         # Adds an extra dimension to the mask (making it [H, W, 1]) for easier color channel broadcasting.
         return mask[..., np.newaxis]
 
+    # Defines the method computing the parts of the color transfer that do not depend on the slider.
+    def compute_color_invariants(self, src, target, mask=None, src_stats=None):
+        # Sets the docstring for the method.
+        """Calcule une fois par swap la source LAB et les statistiques LAB de la source et de la cible.
+
+        Les statistiques de la source et de la cible portent sur la même zone : le visage, sous le masque du swap.
+        src_stats : (moyenne, écart-type) de la source s'ils sont déjà connus.
+        """
+        # Converts the source image to LAB color space (8 bits, the LUT backend maps it directly).
+        src_lab = cv2.cvtColor(src, cv2.COLOR_BGR2LAB)
+        # Converts the target image to LAB color space (the statistics are computed in double precision).
+        target_lab = cv2.cvtColor(target, cv2.COLOR_BGR2LAB)
+
+        # Utilise le masque du swap (self.mask par défaut) pour isoler le visage de la cible
+        # Creates an 8-bit mask of the face area (255 where the mask is 1.0).
+        mask_target = (self.mask if mask is None else mask).astype(np.uint8) * 255
+
+        # Calcul des statistiques
+        # Calculates the Mean and Standard Deviation of the target's face area (using the mask).
+        tgt_mean, tgt_std = cv2.meanStdDev(target_lab, mask=mask_target)
+        # Calculates the Mean and Standard Deviation of the source's face area (unless provided).
+        src_mean, src_std = cv2.meanStdDev(src_lab, mask=mask_target) if src_stats is None else src_stats
+
+        # Flattens the mean and std arrays for easier mathematical operations.
+        src_mean, src_std = src_mean.flatten(), src_std.flatten()
+        # Flattens the mean and std arrays for the target.
+        tgt_mean, tgt_std = tgt_mean.flatten(), tgt_std.flatten()
+
+        # Prevents division by zero errors by replacing zero std dev with 1.0.
+        src_std[src_std == 0] = 1.0
+
+        # Stores the invariants.
+        invariants = {"src_lab": src_lab, "src_mean": src_mean, "src_std": src_std,
+                      "tgt_mean": tgt_mean, "tgt_std": tgt_std}
+        # Normalizes the source image color channels for the float backend (subtract mean, divide by std dev).
+        if self.color_backend == "float":
+            normalized = src_lab.astype(np.float32)
+            normalized -= src_mean
+            normalized /= src_std
+            invariants["normalized"] = normalized
+        # Returns the invariants.
+        return invariants
+
     # Defines the method for color correction/adjustment.
-    def adjust_colors(self, src, target, amount):
+    def adjust_colors(self, src, target, amount, invariants=None):
         # Sets the docstring for the method.
-        """Ajuste les couleurs de la source déformée pour correspondre à la cible."""
+        """Ajuste les couleurs de la source déformée pour correspondre à la cible (invariants du swap réutilisés)."""
         # Returns the source image unmodified if the adjustment amount is 0.
         if amount == 0:
             return src
         # Starts a try block for the color adjustment process.
         try:
-            # Converts the source image to LAB color space (float32).
-            src_lab = cv2.cvtColor(src, cv2.COLOR_BGR2LAB).astype(np.float32)
-            # Converts the target image to LAB color space (float32).
-            target_lab = cv2.cvtColor(target, cv2.COLOR_BGR2LAB).astype(np.float32)
-
-            # Utilise self.mask pour isoler le visage de la cible
-            # Creates an 8-bit mask of the face area (255 where self.mask is 1.0).
-            mask_target = self.mask.astype(np.uint8) * 255
-
-            # Calcul des statistiques
-            # Calculates the Mean and Standard Deviation of the target's face area (using the mask).
-            tgt_mean, tgt_std = cv2.meanStdDev(target_lab, mask=mask_target)
-            # Calculates the Mean and Standard Deviation of the entire source image.
-            src_mean, src_std = cv2.meanStdDev(src_lab)
-
-            # Flattens the mean and std arrays for easier mathematical operations.
-            src_mean, src_std = src_mean.flatten(), src_std.flatten()
-            # Flattens the mean and std arrays for the target.
-            tgt_mean, tgt_std = tgt_mean.flatten(), tgt_std.flatten()
-
-            # Prevents division by zero errors by replacing zero std dev with 1.0.
-            src_std[src_std == 0] = 1.0
+            # Computes the LAB conversions and statistics unless they are cached for this swap.
+            if invariants is None:
+                invariants = self.compute_color_invariants(src, target)
+            src_mean, src_std = invariants["src_mean"], invariants["src_std"]
+            tgt_mean, tgt_std = invariants["tgt_mean"], invariants["tgt_std"]
+
+            # Checks if the lookup table backend is selected.
+            if self.color_backend == "lut":
+                # Turns the per-channel affine mapping into three 256-entry tables.
+                lut = color_transfer_lut(src_mean, src_std, tgt_mean, tgt_std, amount)
+                # Maps the 8-bit LAB source with the tables and converts it back to BGR.
+                return cv2.cvtColor(cv2.LUT(invariants["src_lab"], lut), cv2.COLOR_LAB2BGR)
 
             # Normalisation et transfert de couleur pondéré
-            # Normalizes the source image color channels (subtract mean, divide by std dev).
-            normalized = (src_lab - src_mean) / src_std
-
             # Blends the source and target standard deviations based on the 'amount'.
             target_std_blended = ((1 - amount) * src_std + amount * tgt_std)
             # Blends the source and target means based on the 'amount'.
             target_mean_blended = ((1 - amount) * src_mean + amount * tgt_mean)
 
             # Applies the blended statistics (std dev and mean) to the normalized source.
-            adjusted = normalized * target_std_blended + target_mean_blended
+            adjusted = invariants["normalized"] * target_std_blended
+            adjusted += target_mean_blended
 
             # Conversion finale
             # Clamps the values to the valid 0-255 range and converts back to 8-bit integers.
-            adjusted = np.clip(adjusted, 0, 255).astype(np.uint8)
+            adjusted = np.clip(adjusted, 0, 255, out=adjusted).astype(np.uint8)
             # Converts the adjusted LAB image back to BGR color space.
             return cv2.cvtColor(adjusted, cv2.COLOR_LAB2BGR)
         # Catches any error during color adjustment.
@@ -679,61 +1300,257 @@ class FaceSwapApp:
 
         # Updates the status bar to indicate processing.
         self.status_var.set("Processing... Please wait.")
-        # Changes the cursor to a watch/busy indicator.
+        # Changes the cursor to a watch/busy indicator (the window stays responsive).
         self.root.config(cursor="watch")
-        # Forces the GUI to update immediately.
-        self.root.update()
+        # Makes the pending color updates stale, as they belong to the previous swap.
+        self.jobs.cancel("update")
+        # Takes the images and slider values now, so later changes do not mix into this job.
+        source, target = self.source_image, self.target_image
+        blend_amount, color_amount = self.blend_scale.get() / 100.0, self.color_scale.get() / 100.0
+        origin = (source, self.source_path, self.source_scale, target, self.target_path, self.target_scale)
+        # Runs the swap on the background worker (a newer swap replaces it).
+        self.jobs.submit("swap", lambda cancelled: self.compute_swap(source, target, blend_amount, color_amount,
+                                                                     cancelled),
+                         lambda outcome: self._swap_done(outcome, origin), self._swap_failed)
+
+    # Defines the method computing a swap (runs on the background worker, never touches Tkinter).
+    def compute_swap(self, source, target, blend_amount, color_amount, cancelled=lambda: False,
+                     src_points=None, tgt_points=None, warp_backend=None):
+        # Sets the docstring for the method.
+        """Détection, warping, masquage et premier blending ; retourne les invariants du swap et le résultat.
+
+        src_points / tgt_points évitent la détection quand les landmarks sont déjà connus (export pleine résolution).
+        warp_backend : "similarity" ou "triangles" (self.warp_backend par défaut).
+        """
+        # Uses the warping backend of the engine unless overridden.
+        if warp_backend is None:
+            warp_backend = self.warp_backend
+        # Gets the landmarks for the source image (cached by image content).
+        if src_points is None:
+            src_points = self.get_still_landmarks(source)
+        # Gets the landmarks for the target image (cached by image content).
+        if tgt_points is None:
+            tgt_points = self.get_still_landmarks(target)
+
+        # Checks if faces were detected in both images.
+        if src_points is None or tgt_points is None:
+            # Raises an error if face detection failed.
+            raise ValueError("Face not detected in one or both images.")
+        # Stops if a newer request made this swap stale.
+        if cancelled():
+            raise JobCancelled()
+
+        # Zone d'intérêt (ROI) : boîte du visage cible + élargissement du hull (15 %) + rayon du flou + marge
+        # Gets the bounding box of the target face.
+        x, y, w, h = cv2.boundingRect(cv2.convexHull(tgt_points))
+        # Gets the padding that keeps the expanded, blurred mask inside the ROI (plus room for the coarse pyramid bands,
+        # so the blending backend can change without a new swap).
+        pad = int(0.15 * max(w, h)) + self.still_roi_padding + 2 ** self.pyramid_levels
+        # Calculates the padded ROI, clipped to the target image.
+        x0, y0 = max(x - pad, 0), max(y - pad, 0)
+        x1, y1 = min(x + w + pad, target.shape[1]), min(y + h + pad, target.shape[0])
+        # Gets the target ROI (a view, the target itself is never modified).
+        target_roi = target[y0:y1, x0:x1]
+
+        # Crée le masque (amélioré) sur l'image cible
+        # Creates the soft, expanded mask based on the target face landmarks, in ROI coordinates.
+        mask = self.create_mask((tgt_points - [x0, y0]).astype(np.int32), target_roi.shape)
+
+        # Calcule la matrice de transformation affine
+        # Estimates the affine (translation, rotation, scale) transformation matrix.
+        matrix, _ = cv2.estimateAffinePartial2D(src_points.astype(np.float32), tgt_points.astype(np.float32))
+
+        # Résolution de travail de la source : pas plus que ce que le visage cible demande (+ marge)
+        # Gets the scale the source face is drawn at in the target (< 1 = the source is larger than needed).
+        needed = np.sqrt(abs(np.linalg.det(matrix[:, :2]))) * self.source_resolution_margin
+        # Keeps the source landmarks matching the (possibly reduced) source for the triangle warp.
+        warp_points = src_points
+        # Downscales the source once (area filter) and folds the reduction into the transformation.
+        if needed < 1.0:
+            height, width = source.shape[:2]
+            source = cv2.resize(source, (max(1, round(width * needed)), max(1, round(height * needed))),
+                                interpolation=cv2.INTER_AREA)
+            # Maps the reduced pixels back to the original ones (resize keeps the pixel centers aligned).
+            scale_x, scale_y = width / source.shape[1], height / source.shape[0]
+            matrix = matrix.copy()
+            matrix[:, 2] += matrix[:, 0] * 0.5 * (scale_x - 1) + matrix[:, 1] * 0.5 * (scale_y - 1)
+            matrix[:, 0] *= scale_x
+            matrix[:, 1] *= scale_y
+            warp_points = (src_points + 0.5) / [scale_x, scale_y] - 0.5
+
+        # Applique la transformation à l'image source
+        # Shifts the transformation so the warp writes directly into ROI coordinates.
+        roi_matrix = matrix.copy()
+        roi_matrix[0, 2] -= x0
+        roi_matrix[1, 2] -= y0
+        # Performs the warping (transformation) of the source image onto the target ROI only.
+        warped_src = cv2.warpAffine(source, roi_matrix,
+                                    (x1 - x0, y1 - y0),
+                                    flags=cv2.INTER_LINEAR,
+                                    # Uses BORDER_REPLICATE to fill empty areas with surrounding pixel colors (no black borders).
+                                    borderMode=cv2.BORDER_REPLICATE)
+        # Replaces the face with the piecewise-affine warp (the similarity warp stays around it, under the mask edge).
+        if warp_backend == "triangles":
+            TriangleWarp(source, warp_points).warp(tgt_points, warped_src, (x0, y0))
+        # Stops if a newer request made this swap stale.
+        if cancelled():
+            raise JobCancelled()
+
+        # Caches what the slider updates would otherwise recompute (LAB conversions, statistics, masks).
+        invariants = self.compute_color_invariants(warped_src, target_roi, mask)
+        invariants.update({"warped_src": warped_src, "target": target_roi, "mask": mask,
+                           "full_target": target, "roi": (x0, y0, x1, y1),
+                           "src_points": src_points, "tgt_points": tgt_points, "warp_backend": warp_backend,
+                           "hull": (cv2.convexHull(tgt_points) - [x0, y0]).astype(np.int32)})
+        self.add_blend_invariants(invariants)
+
+        # Lance le blending initial
+        # Computes the first result with the slider values of the request.
+        return invariants, self.compose_result(invariants, blend_amount, color_amount), (blend_amount, color_amount)
+
+    # Defines the method storing a finished swap (runs on the Tk thread).
+    def _swap_done(self, outcome, origin=None):
+        # Unpacks the swap data, its first result and the slider values it was computed with.
+        invariants, result, amounts = outcome
+        # Stores where the swapped images come from (the export re-reads the reduced ones).
+        self.swap_origin = origin
+        # Stocke les résultats pour les mises à jour en direct via les sliders
+        # Stores the warped source image.
+        self.warped_src = invariants["warped_src"]
+        # Stores the generated mask.
+        self.mask = invariants["mask"]
+        # Stores the per-swap invariants and forgets the preview proxy of the previous swap.
+        self.swap_invariants = invariants
+        self.preview_invariants = None
+        # Restores the cursor to normal.
+        self.root.config(cursor="")
+        # Displays the result.
+        self.show_new_result(result)
+        # Recomputes it if the sliders moved while the swap was running.
+        if amounts != (self.blend_scale.get() / 100.0, self.color_scale.get() / 100.0):
+            self.update_face_swap()
 
-        # Starts a try block for the complex image processing.
-        try:
-            # Gets the landmarks for the source image.
-            src_points = self.get_landmarks(self.source_image)
-            # Gets the landmarks for the target image.
-            tgt_points = self.get_landmarks(self.target_image)
-
-            # Checks if faces were detected in both images.
-            if src_points is None or tgt_points is None:
-                # Raises an error if face detection failed.
-                raise ValueError("Face not detected in one or both images.")
-
-            # Crée le masque (amélioré) sur l'image cible
-            # Creates the soft, expanded mask based on the target face landmarks.
-            mask = self.create_mask(tgt_points, self.target_image.shape)
-
-            # Calcule la matrice de transformation affine
-            # Estimates the affine (translation, rotation, scale) transformation matrix.
-            matrix, _ = cv2.estimateAffinePartial2D(src_points.astype(np.float32), tgt_points.astype(np.float32))
-
-            # Applique la transformation à l'image source
-            # Performs the warping (transformation) of the source image onto the target space.
-            warped_src = cv2.warpAffine(self.source_image, matrix,
-                                        (self.target_image.shape[1], self.target_image.shape[0]),
-                                        flags=cv2.INTER_LINEAR,
-                                        # Uses BORDER_REPLICATE to fill empty areas with surrounding pixel colors (no black borders).
-                                        borderMode=cv2.BORDER_REPLICATE)
-
-            # Stocke les résultats pour les mises à jour en direct via les sliders
-            # Stores the warped source image.
-            self.warped_src = warped_src
-            # Stores the generated mask.
-            self.mask = mask
-
-            # Lance le blending initial
-            # Calls the method to perform the final blending and display the result.
+    # Defines the method reporting a failed swap (runs on the Tk thread).
+    def _swap_failed(self, error):
+        # Restores the cursor to normal.
+        self.root.config(cursor="")
+        # Shows an error message.
+        messagebox.showerror("Error", f"Face swap failed: {str(error)}")
+        # Updates the status bar.
+        self.status_var.set("Face swap failed.")
+        # Clears stored intermediate results.
+        self.warped_src = None
+        self.mask = None
+        self.swap_invariants = None
+        self.preview_invariants = None
+        self.swap_origin = None
+
+    # Defines the method caching the inputs of the float blend.
+    def add_blend_invariants(self, invariants):
+        # Caches the 3-channel mask and the float target (only the float backend uses them).
+        if self.blend_backend == "float":
+            invariants["mask_3ch"] = np.repeat(invariants["mask"], 3, axis=2)
+            invariants["target_float"] = invariants["target"].astype(np.float32)
+
+    # Defines the method combining the cached swap data for given slider values.
+    def compose_result(self, invariants, blend_amount, color_amount):
+        # Sets the docstring for the method.
+        """Calcule l'image finale à partir des invariants du swap (pleine résolution ou proxy d'aperçu)."""
+        # 1. Ajustement des couleurs
+        # Checks if color adjustment is needed.
+        if color_amount > 0:
+            # Performs color adjustment on the warped source.
+            color_adjusted = self.adjust_colors(invariants["warped_src"], invariants["target"], color_amount,
+                                                invariants)
+        # Executes if no color adjustment is needed.
+        else:
+            # Uses the original warped source image.
+            color_adjusted = invariants["warped_src"]
+
+        # 2. Blend pondéré (weighted blend)
+        # Checks if the seamless clone backend is selected.
+        if self.blend_backend == "poisson":
+            # Prepares the tight crop and the hull mask once per swap (and per preview proxy).
+            if "clone_region" not in invariants:
+                invariants["clone_region"] = seamless_clone_region(invariants["hull"], invariants["target"].shape)
+            # Clones the source into the target; the fixed-point blend below then applies the opacity.
+            color_adjusted = blend_seamless(color_adjusted, invariants["target"], invariants["clone_region"])
+        # Checks if the fixed-point backend is selected.
+        if self.blend_backend in ("fixed", "poisson"):
+            # Converts the soft mask times the blend amount into a rounded 8-bit alpha.
+            alpha = cv2.convertScaleAbs(invariants["mask"][..., 0], alpha=255.0 * blend_amount)
+            # Blends in fixed point directly into the result image.
+            return self.paste_roi(invariants, blend_fixed_point(color_adjusted, invariants["target"], alpha))
+        # Checks if the multi-band backend is selected.
+        if self.blend_backend == "pyramid":
+            # Builds the target and mask pyramids once per swap (and per level count).
+            levels = self.pyramid_levels
+            if invariants.get("pyramid_levels") != levels:
+                invariants["target_pyramid"] = laplacian_pyramid(invariants["target"], levels)
+                invariants["mask_pyramid"] = gaussian_pyramid(invariants["mask"][..., 0], levels)
+                invariants["pyramid_levels"] = levels
+            # Blends band by band (only the source pyramid is rebuilt for each slider value).
+            return self.paste_roi(invariants, blend_pyramid(color_adjusted, invariants["target"], levels=levels,
+                                                            amount=blend_amount,
+                                                            dst_pyramid=invariants["target_pyramid"],
+                                                            alpha_pyramid=invariants["mask_pyramid"]))
+
+        # Prépare les images et le masque pour les calculs float
+        # Caches the float inputs if the swap was made with another backend.
+        if "target_float" not in invariants:
+            self.add_blend_invariants(invariants)
+        # Gets the color-adjusted source image as float32.
+        A = color_adjusted.astype(np.float32)  # Source (ajustée en couleur)
+        # Gets the original target image as float32 (cached once per swap).
+        B = invariants["target_float"]  # Cible (originale)
+
+        # Convertit le masque 1 canal en masque 3 canaux
+        # Gets the 1-channel mask repeated 3 times to match the BGR color channels (cached once per swap).
+        mask_3ch = invariants["mask_3ch"]
+
+        # Final Alpha: Masque doux multiplié par la quantité de blend (opacité)
+        # Calculates the final weighted mask (softness * opacity).
+        final_alpha = mask_3ch * blend_amount
+
+        # Calculates the contribution of the source image (Source * Alpha).
+        source_contribution = cv2.multiply(A, final_alpha)
+        # Calculates the contribution of the target image (Target * (1 - Alpha)).
+        target_contribution = cv2.multiply(B, (1.0 - final_alpha))
+
+        # 3. Fusion finale
+        # Adds the two contributions and converts the result back to 8-bit integers.
+        return self.paste_roi(invariants, cv2.add(source_contribution, target_contribution).astype(np.uint8))
+
+    # Defines the method compositing a blended ROI back into the target.
+    def paste_roi(self, invariants, blended):
+        # Returns the blended image as is when it covers the whole target.
+        if "roi" not in invariants:
+            return blended
+        # Copies the target and writes the blended ROI into it.
+        x0, y0, x1, y1 = invariants["roi"]
+        result = invariants["full_target"].copy()
+        result[y0:y1, x0:x1] = blended
+        # Returns the composited result.
+        return result
+
+    # Defines the method applying the warping choice.
+    def set_warp_backend(self):
+        # Sets the docstring for the method.
+        """Applique le warp choisi au mode Live tout de suite et au prochain swap."""
+        # Stores the backend (the live loop reads it on every frame).
+        self.warp_backend = self.warp_var.get()
+        # Updates the status bar.
+        self.status_var.set(f"Warp: {self.warp_backend} (applies to the next swap)")
+
+    # Defines the method applying the blending choice.
+    def set_blend_backend(self):
+        # Sets the docstring for the method.
+        """Applique le blending choisi au mode Live et recalcule le résultat affiché (sans nouveau swap)."""
+        # Stores the backend (the live loop reads it on every frame).
+        self.blend_backend = self.blend_mode_var.get()
+        # Recomputes the current result with the new backend.
+        if self.swap_invariants is not None:
             self.update_face_swap()
-        # Catches any error during the swap process.
-        except Exception as e:
-            # Shows an error message.
-            messagebox.showerror("Error", f"Face swap failed: {str(e)}")
-            # Updates the status bar.
-            self.status_var.set("Face swap failed.")
-            # Clears stored intermediate results.
-            self.warped_src = None
-            self.mask = None
-        # Executes regardless of try/except outcome.
-        finally:
-            # Restores the cursor to normal.
-            self.root.config(cursor="")
 
     # Defines the method to update the final result based on slider values.
     def update_face_swap(self):
@@ -742,60 +1559,45 @@ class FaceSwapApp:
         # Returns immediately if the necessary intermediate data is missing.
         if self.warped_src is None or self.mask is None:
             return
-
-        # Starts a try block for the update logic.
-        try:
-            # Gets the blend slider value (0.0 to 1.0).
-            blend_amount = self.blend_scale.get() / 100.0
-            # Gets the color slider value (0.0 to 1.0).
-            color_amount = self.color_scale.get() / 100.0
-
-            # 1. Ajustement des couleurs
-            # Checks if color adjustment is needed.
-            if color_amount > 0:
-                # Performs color adjustment on the warped source.
-                color_adjusted = self.adjust_colors(self.warped_src, self.target_image, color_amount)
-            # Executes if no color adjustment is needed.
-            else:
-                # Uses the original warped source image.
-                color_adjusted = self.warped_src
-
-            # Prépare les images et le masque pour les calculs float
-            # Gets the color-adjusted source image as float32.
-            A = color_adjusted.astype(np.float32)  # Source (ajustée en couleur)
-            # Gets the original target image as float32.
-            B = self.target_image.astype(np.float32)  # Cible (originale)
-
-            # Convertit le masque 1 canal en masque 3 canaux
-            # Repeats the 1-channel mask 3 times to match the BGR color channels.
-            mask_3ch = np.repeat(self.mask, 3, axis=2)
-
-            # Final Alpha: Masque doux multiplié par la quantité de blend (opacité)
-            # Calculates the final weighted mask (softness * opacity).
-            final_alpha = mask_3ch * blend_amount
-
-            # 2. Blend pondéré (weighted blend)
-            # Calculates the contribution of the source image (Source * Alpha).
-            source_contribution = cv2.multiply(A, final_alpha)
-            # Calculates the contribution of the target image (Target * (1 - Alpha)).
-            target_contribution = cv2.multiply(B, (1.0 - final_alpha))
-
-            # 3. Fusion finale
-            # Adds the two contributions and converts the result back to 8-bit integers.
-            self.result_image = cv2.add(source_contribution, target_contribution).astype(np.uint8)
-
-            # Displays the final result image.
-            self.show_result()
-            # Enables the save button.
-            self.save_button.config(state=NORMAL)
-            # Enables the email button.
-            self.email_button.config(state=NORMAL)
-            # Updates the status bar.
+        # Cancels the pending preview so it does not replace the full-resolution result.
+        if self.preview_job is not None:
+            self.root.after_cancel(self.preview_job)
+            self.preview_job = None
+
+        # Gets the blend slider value (0.0 to 1.0).
+        blend_amount = self.blend_scale.get() / 100.0
+        # Gets the color slider value (0.0 to 1.0).
+        color_amount = self.color_scale.get() / 100.0
+        # Computes the full-resolution result on the background worker (a newer update replaces it).
+        invariants = self.swap_invariants
+        self.jobs.submit("update", lambda cancelled: self.compose_result_timed(invariants, blend_amount, color_amount),
+                         lambda outcome: self.show_new_result(*outcome),
+                         lambda e: print(f"Update failed: {str(e)}"))
+
+    # Defines the method timing a full-resolution composition (runs on the background worker).
+    def compose_result_timed(self, invariants, blend_amount, color_amount):
+        # Sets the docstring for the method.
+        """Retourne (résultat, durée en ms) pour comparer le coût des modes de blending."""
+        # Computes the result and measures it.
+        start = time.perf_counter()
+        result = self.compose_result(invariants, blend_amount, color_amount)
+        return result, (time.perf_counter() - start) * 1000.0
+
+    # Defines the method displaying a new full-resolution result (runs on the Tk thread).
+    def show_new_result(self, result, compose_ms=None):
+        # Stores the result image.
+        self.result_image = result
+        # Displays the final result image.
+        self.show_result()
+        # Enables the save button.
+        self.save_button.config(state=NORMAL)
+        # Enables the email button.
+        self.email_button.config(state=NORMAL)
+        # Updates the status bar (with the cost of the blending mode after a slider update).
+        if compose_ms is None:
             self.status_var.set("Face swap completed. Adjust sliders for best results.")
-        # Catches any error during the update process.
-        except Exception as e:
-            # Prints the error to the console.
-            print(f"Update failed: {str(e)}")
+        else:
+            self.status_var.set(f"Face swap updated ({self.blend_backend} blend: {compose_ms:.0f} ms).")
 
     # Defines the event handler for slider release.
     def update_face_swap_event(self, event=None):
@@ -806,6 +1608,76 @@ class FaceSwapApp:
             # Calls the main update function.
             self.update_face_swap()
 
+    # Defines the event handler for slider motion.
+    def preview_face_swap_event(self, value=None):
+        # Sets the docstring for the method.
+        """Programme un aperçu réduit pendant le déplacement du slider (au plus un par rafraîchissement)."""
+        # Ignores the motion before the first swap, and while a preview is already pending.
+        if self.swap_invariants is None or self.preview_job is not None:
+            return
+        # Schedules the preview (the motion events in between are merged into it).
+        self.preview_job = self.root.after(self.preview_interval_ms, self._render_preview)
+
+    # Defines the method rendering the preview on the proxy.
+    def _render_preview(self):
+        # Marks the preview as no longer pending.
+        self.preview_job = None
+        # Starts a try block for the preview.
+        try:
+            # Computes the result at display resolution and shows it (self.result_image keeps the full result).
+            preview = self.compose_result(self._get_preview_invariants(), self.blend_scale.get() / 100.0,
+                                          self.color_scale.get() / 100.0)
+            self.show_image(preview, self.result_label)
+        # Catches any error during the preview.
+        except Exception as e:
+            # Prints the error to the console.
+            print(f"Preview failed: {str(e)}")
+
+    # Defines the method returning the swap invariants downscaled to the result display.
+    def _get_preview_invariants(self):
+        # Gets the size of the result display (as in show_image).
+        parent_width = self.result_label.master.winfo_width()
+        parent_height = self.result_label.master.winfo_height()
+        if parent_width <= 1 or parent_height <= 1:
+            parent_width, parent_height = self.display_width, self.display_height
+        # Calculates the proxy size (never larger than the full image).
+        full = self.swap_invariants
+        h, w = full["full_target"].shape[:2]
+        scale = min(parent_width / w, parent_height / h, 1.0)
+        size = (max(1, int(w * scale)), max(1, int(h * scale)))
+        # Uses the full-resolution data when the display is not smaller.
+        if size == (w, h):
+            return full
+        # Returns the proxy if it is already built for this size.
+        if self.preview_invariants is not None and self.preview_invariants["size"] == size:
+            return self.preview_invariants
+        # Builds the proxy once per swap and display size (area averaging; the LAB statistics stay full-resolution).
+        proxy = {key: full[key] for key in ("src_mean", "src_std", "tgt_mean", "tgt_std")}
+        proxy["size"] = size
+        # Scales the whole target, then the ROI to the proxy grid.
+        proxy["full_target"] = cv2.resize(full["full_target"], size, interpolation=cv2.INTER_AREA)
+        x0, y0, x1, y1 = full["roi"]
+        x0, y0 = int(x0 * size[0] / w), int(y0 * size[1] / h)
+        x1, y1 = max(x0 + 1, int(round(x1 * size[0] / w))), max(y0 + 1, int(round(y1 * size[1] / h)))
+        proxy["roi"] = (x0, y0, x1, y1)
+        roi_size = (x1 - x0, y1 - y0)
+        # Scales the ROI data.
+        proxy["target"] = proxy["full_target"][y0:y1, x0:x1]
+        proxy["warped_src"] = cv2.resize(full["warped_src"], roi_size, interpolation=cv2.INTER_AREA)
+        proxy["src_lab"] = cv2.cvtColor(proxy["warped_src"], cv2.COLOR_BGR2LAB)
+        if "normalized" in full:
+            proxy["normalized"] = cv2.resize(full["normalized"], roi_size, interpolation=cv2.INTER_AREA)
+        proxy["mask"] = cv2.resize(full["mask"], roi_size, interpolation=cv2.INTER_AREA).reshape(
+            roi_size[1], roi_size[0], 1)
+        # Scales the target hull (ROI coordinates) to the proxy ROI.
+        full_x0, full_y0 = full["roi"][:2]
+        proxy["hull"] = np.round((full["hull"] + [full_x0, full_y0]) * [size[0] / w, size[1] / h]
+                                 - [x0, y0]).astype(np.int32)
+        self.add_blend_invariants(proxy)
+        # Stores and returns the proxy.
+        self.preview_invariants = proxy
+        return proxy
+
     # --- Fonctions d'Affichage et de Fichier ---
     # Defines the method to display an OpenCV image in a Tkinter Label.
     def show_image(self, image, label_widget):
@@ -872,8 +1744,21 @@ class FaceSwapApp:
             # Filters the file types shown in the dialog.
             filetypes=[("JPEG", "*.jpg"), ("PNG", "*.png")]
         )
+        # Re-renders from the original files when the swap used reduced images.
+        if path and self.swap_origin is not None and min(self.swap_origin[2], self.swap_origin[5]) < 1.0:
+            # Updates the status bar.
+            self.status_var.set("Rendering full-resolution export...")
+            # Changes the cursor to a watch/busy indicator.
+            self.root.config(cursor="watch")
+            # Takes the swap and slider values now, so later changes do not mix into the export.
+            origin, invariants = self.swap_origin, self.swap_invariants
+            blend_amount, color_amount = self.blend_scale.get() / 100.0, self.color_scale.get() / 100.0
+            # Renders and writes the export on the background worker.
+            self.jobs.submit("export", lambda cancelled: self.export_full_resolution(
+                                 path, origin, invariants, blend_amount, color_amount, cancelled),
+                             self._export_done, self._export_failed)
         # Proceeds if the user selected a path.
-        if path:
+        elif path:
             # Starts a try block for file writing.
             try:
                 # Writes the result image to the specified path using OpenCV.
@@ -887,6 +1772,47 @@ class FaceSwapApp:
                 # Shows an error message.
                 messagebox.showerror("Save Error", str(e))
 
+    # Defines the method rendering the result from the original files (runs on the background worker).
+    def export_full_resolution(self, path, origin, invariants, blend_amount, color_amount, cancelled=lambda: False):
+        # Sets the docstring for the method.
+        """Relit les originaux réduits, refait le swap en pleine résolution (landmarks remis à l'échelle) et l'écrit."""
+        # Unpacks the images, files and scales of the swap.
+        source, source_path, source_scale, target, target_path, target_scale = origin
+        # Re-reads the reduced images at full resolution (the others are already full resolution).
+        if source_scale < 1.0:
+            source = self.read_image(source_path)
+        if target_scale < 1.0:
+            target = self.read_image(target_path)
+        # Scales the landmarks of the swap to the full images (no new detection).
+        src_points = np.round((invariants["src_points"] + 0.5) / source_scale - 0.5).astype(np.int32)
+        tgt_points = np.round((invariants["tgt_points"] + 0.5) / target_scale - 0.5).astype(np.int32)
+        # Computes the swap with the slider values of the request.
+        _, result, _ = self.compute_swap(source, target, blend_amount, color_amount, cancelled,
+                                         src_points, tgt_points, invariants["warp_backend"])
+        # Writes the result image to the specified path using OpenCV.
+        if not cv2.imwrite(path, result):
+            raise ValueError(f"Could not write {path}")
+        # Returns the path.
+        return path
+
+    # Defines the method reporting a written export (runs on the Tk thread).
+    def _export_done(self, path):
+        # Restores the cursor to normal.
+        self.root.config(cursor="")
+        # Shows a success message.
+        messagebox.showinfo("Saved", f"Image saved at:\n{path}")
+        # Updates the status bar.
+        self.status_var.set(f"Saved to {os.path.basename(path)}")
+
+    # Defines the method reporting a failed export (runs on the Tk thread).
+    def _export_failed(self, error):
+        # Restores the cursor to normal.
+        self.root.config(cursor="")
+        # Shows an error message.
+        messagebox.showerror("Save Error", str(error))
+        # Updates the status bar.
+        self.status_var.set("Save failed.")
+
     # Defines the method to email the result image.
     def email_result(self):
         # Sets the docstring for the method.
@@ -911,6 +1837,12 @@ class FaceSwapApp:
         # Forces the GUI to update immediately.
         self.root.update()
 
+        # Imports the email modules on first use (rarely clicked, kept out of the startup).
+        import smtplib
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.image import MIMEImage
+        from email.mime.text import MIMEText
+
         # Starts a try block for the emailing process.
         try:
             # Sauvegarde temporaire du résultat
@@ -982,104 +1914,274 @@ class FaceSwapApp:
     # Defines the method to open the webcam for live face swapping.
     def open_live_video(self):
         # Sets the docstring for the method.
-        """Ouvre la webcam pour l'échange de visage en temps réel."""
+        """Ouvre la webcam pour l'échange de visage en temps réel (pipeline capture -> swap -> affichage)."""
         # Checks if a source image has been loaded for the face to be swapped in.
         if self.source_image is None:
             # Shows a warning if the source image is missing.
             messagebox.showwarning("Live Swap", "Please load a source image first.")
             return
-
-        # Opens the webcam.
-        cap = cv2.VideoCapture(0)
-        # Checks if the camera opened successfully.
-        if not cap.isOpened():
-            # Shows an error if the webcam cannot be accessed.
-            messagebox.showerror("Error", "Cannot access webcam.")
+        # Ignores the click if live mode is already running.
+        if self.live_stop_event is not None:
             return
 
-        # Updates the status bar.
-        self.status_var.set("Live video started. Press ESC to stop.")
-
         # Gets the landmarks for the static source image.
-        src_landmarks = self.get_landmarks(self.source_image)
+        src_landmarks = self.get_still_landmarks(self.source_image)
         # Checks if a face was detected in the source image.
         if src_landmarks is None:
             # Shows an error if no face is found in the source.
             messagebox.showerror("Error", "Face not detected in the source image for Live Swap.")
-            # Releases the camera.
-            cap.release()
             return
 
-        # Starts the loop for the live video feed.
-        while True:
-            # Reads a frame from the webcam.
-            ret, frame = cap.read()
-            # Breaks the loop if reading failed.
+        # Opens the configured frame source (the first webcam by default).
+        cap = open_frame_source(self.live_source, loop=True)
+        # Checks if the camera opened successfully.
+        if not cap.isOpened():
+            # Shows an error if the webcam cannot be accessed.
+            messagebox.showerror("Error", "Cannot access webcam.")
+            return
+
+        # Updates the status bar.
+        self.status_var.set("Live video started. Press ESC to stop, H to toggle the FPS/latency overlay.")
+
+        # Creates the buffer pool for this session, sized to the camera resolution and the window size.
+        self.live_pool = FrameBufferPool()
+        frame_shape = (int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), 3)
+        # Reserves the frame-sized working buffers when the camera reports its resolution.
+        if frame_shape[0] > 0 and frame_shape[1] > 0:
+            for name in ("warp", "blend_acc", "blend_tmp"):
+                self.live_pool.reserve(name, frame_shape, np.uint16 if name.startswith("blend") else np.uint8)
+            for name in ("gray_0", "gray_1", "mask", "mask_blur"):
+                self.live_pool.reserve(name, frame_shape[:2])
+        # Reserves the letterbox canvas at the initial window size.
+        self.live_pool.reserve("canvas", (self.live_window_size[1], self.live_window_size[0], 3))
+
+        # Creates the timing statistics for this session.
+        self.live_stats = LiveStats()
+
+        # Creates the resizable live window.
+        cv2.namedWindow("Live Face Swap", cv2.WINDOW_NORMAL)
+        cv2.resizeWindow("Live Face Swap", *self.live_window_size)
+
+        # Creates the event shared by all stages to request a stop.
+        self.live_stop_event = threading.Event()
+        # Creates the queue between the capture stage and the swap stage.
+        capture_queue = LatestFrameQueue()
+        # Creates the queue between the swap stage and the display stage.
+        self.live_display_queue = LatestFrameQueue()
+        # Stores the camera so the display stage can release it on exit.
+        self.live_capture = cap
+
+        # Creates the face tracker and the landmark propagator for this session.
+        tracker, flow = self.create_live_trackers()
+
+        # Creates the capture and swap stages as daemon threads (they never touch Tkinter).
+        self.live_threads = [
+            threading.Thread(target=self._live_capture_stage,
+                             args=(cap, self.live_stop_event, capture_queue, self.live_pool, frame_shape,
+                                   self.live_stats),
+                             daemon=True),
+            threading.Thread(target=self._live_swap_stage,
+                             args=(self.live_stop_event, capture_queue, self.live_display_queue,
+                                   self.source_image, src_landmarks, tracker, flow, self.live_pool,
+                                   self.live_stats),
+                             daemon=True),
+        ]
+        # Starts both worker stages.
+        for thread in self.live_threads:
+            thread.start()
+
+        # Schedules the display stage on the Tk event loop so the window stays responsive.
+        self.root.after(self.live_display_interval_ms, self._live_display_stage)
+
+    # Defines the capture stage, which reads the camera as fast as it delivers frames.
+    def _live_capture_stage(self, cap, stop_event, capture_queue, pool, frame_shape, stats):
+        # Sets the docstring for the method.
+        """Étape de capture : lit la caméra sans jamais attendre le swap."""
+        # Loops until a stop is requested.
+        while not stop_event.is_set():
+            # Takes a free frame buffer from the pool.
+            buffer = pool.acquire_frame(frame_shape)
+            # Reads a frame from the webcam directly into the buffer.
+            with stats.time("capture"):
+                ret, frame = cap.read(buffer)
+            # Stops the whole pipeline if reading failed.
             if not ret:
+                stop_event.set()
                 break
-
+            # Counts the frame OpenCV had to allocate because the buffer did not fit (it is recycled afterwards).
+            if frame is not buffer:
+                pool.count_growth()
+            # Publishes the frame; an unprocessed older frame is dropped and its buffer recycled.
+            pool.release_frame(capture_queue.put(frame))
+
+    # Defines the swap stage, which processes only the most recent captured frame.
+    def _live_swap_stage(self, stop_event, capture_queue, display_queue, source_image, src_landmarks, tracker=None,
+                         flow=None, pool=None, stats=None):
+        # Sets the docstring for the method.
+        """Étape de swap : traite la dernière image capturée et la transmet à l'affichage."""
+        # Loops until a stop is requested.
+        while not stop_event.is_set():
+            # Waits briefly for the next frame so the stop event is checked regularly.
+            frame = capture_queue.get(timeout=0.1)
+            # Loops again if no frame arrived.
+            if frame is None:
+                continue
             # Calls the method to perform the live swap on the current frame.
-            result = self.perform_live_swap(frame, self.source_image, src_landmarks)
-            # Displays the result in a new window.
-            cv2.imshow("Live Face Swap", result)
-
-            # Checks if the Escape key (key code 27) was pressed.
-            if cv2.waitKey(1) == 27:
-                # Breaks the loop to stop the live feed.
-                break
-
+            try:
+                result = self.perform_live_swap(frame, source_image, src_landmarks, tracker=tracker, flow=flow,
+                                                pool=pool, stats=stats)
+            # Falls back to the raw frame if the swap fails for this frame.
+            except Exception as e:
+                print(f"Live swap failed: {str(e)}")
+                result = frame
+            # Closes the allocation accounting of this frame.
+            if pool is not None:
+                pool.end_frame()
+            # Publishes the result; an undisplayed older result is dropped and its buffer recycled.
+            dropped = display_queue.put(result)
+            if pool is not None:
+                pool.release_frame(dropped)
+
+    # Defines the display stage, polled from the Tk event loop.
+    def _live_display_stage(self):
+        # Sets the docstring for the method.
+        """Étape d'affichage : montre le dernier résultat puis se replanifie via root.after."""
+        # Returns if live mode has already been stopped.
+        if self.live_stop_event is None:
+            return
+        # Takes the latest result without blocking the Tk thread.
+        result = self.live_display_queue.get(timeout=0)
+        # Displays the result in the live window if a new one is available.
+        if result is not None:
+            # Gets the current size of the window (includes maximized/fullscreen).
+            try:
+                _, _, win_w, win_h = cv2.getWindowImageRect("Live Face Swap")
+            # Falls back to the frame size if OpenCV < 4.5.
+            except Exception:
+                win_h, win_w = result.shape[:2]
+            # Times the display.
+            with self.live_stats.time("display"):
+                # Letterboxes the result into the pooled window canvas.
+                display = self._letterbox_to_window(result, win_w, win_h, self.live_pool)
+                # Draws the FPS/latency overlay if enabled.
+                if self.live_show_hud:
+                    self._draw_live_hud(display, self.live_stats)
+                # Shows the frame.
+                cv2.imshow("Live Face Swap", display)
+            # Counts the displayed frame for the rolling FPS.
+            self.live_stats.frame_shown()
+            # Gives the frame buffer back for the next capture (imshow keeps its own copy).
+            self.live_pool.release_frame(result)
+        # Reads the pressed key.
+        key = cv2.waitKey(1) & 0xFF
+        # Checks if the Escape key (key code 27) was pressed or a stage requested a stop.
+        if key == 27 or self.live_stop_event.is_set():
+            # Stops the live pipeline.
+            self.close_live_video()
+            return
+        # Toggles the FPS/latency overlay with the H key.
+        if key in (ord('h'), ord('H')):
+            self.live_show_hud = not self.live_show_hud
+        # Schedules the next display tick.
+        self.root.after(self.live_display_interval_ms, self._live_display_stage)
+
+    # Defines the helper that draws the FPS/latency overlay onto a displayed frame.
+    def _draw_live_hud(self, image, stats):
+        # Sets the docstring for the method.
+        """Dessine le FPS glissant et les latences p50/p95 par étape en haut à gauche de l'image."""
+        # Draws each line with a dark outline so it stays readable on any background.
+        for i, line in enumerate(stats.summary_lines()):
+            position = (10, 22 + 18 * i)
+            cv2.putText(image, line, position, cv2.FONT_HERSHEY_PLAIN, 1.1, (0, 0, 0), 3, cv2.LINE_AA)
+            cv2.putText(image, line, position, cv2.FONT_HERSHEY_PLAIN, 1.1, (0, 255, 0), 1, cv2.LINE_AA)
+
+    # Defines the helper that fits a frame into the window while keeping its aspect ratio.
+    def _letterbox_to_window(self, frame, win_w, win_h, pool=None):
+        # Sets the docstring for the method.
+        """Redimensionne frame pour remplir la fenêtre tout en conservant le ratio (letterboxing)."""
+        # Returns the frame unchanged if the window size is unknown.
+        if win_w <= 0 or win_h <= 0:
+            return frame
+        # Uses a throwaway pool (plain allocations) when no pool is provided.
+        if pool is None:
+            pool = FrameBufferPool()
+        # Calculates the scale that fits the frame inside the window.
+        h, w = frame.shape[:2]
+        scale = min(win_w / w, win_h / h)
+        new_w, new_h = max(int(w * scale), 1), max(int(h * scale), 1)
+        # Resizes the frame into a pooled buffer.
+        resized = cv2.resize(frame, (new_w, new_h), dst=pool.get("resized", (new_h, new_w, 3)),
+                             interpolation=cv2.INTER_LINEAR)
+        # Takes the pooled canvas of the window size.
+        canvas = pool.get("canvas", (win_h, win_w, 3))
+        # Calculates the offsets that center the frame.
+        y0 = (win_h - new_h) // 2
+        x0 = (win_w - new_w) // 2
+        # Clears only the black bands around the frame.
+        canvas[:y0] = 0
+        canvas[y0 + new_h:] = 0
+        canvas[y0:y0 + new_h, :x0] = 0
+        canvas[y0:y0 + new_h, x0 + new_w:] = 0
+        # Copies the resized frame into the center of the canvas.
+        canvas[y0:y0 + new_h, x0:x0 + new_w] = resized
+        # Returns the letterboxed canvas.
+        return canvas
+
+    # Defines the method to stop the live pipeline and release its resources.
+    def close_live_video(self):
+        # Sets the docstring for the method.
+        """Arrête les étapes du mode Live et libère la webcam."""
+        # Returns if live mode is not running.
+        if self.live_stop_event is None:
+            return
+        # Signals all stages to stop.
+        self.live_stop_event.set()
+        # Waits for the worker stages to finish their current frame.
+        for thread in self.live_threads:
+            thread.join(timeout=1.0)
         # Releases the camera resource.
-        cap.release()
+        self.live_capture.release()
         # Closes all OpenCV windows.
         cv2.destroyAllWindows()
-        # Updates the status bar.
-        self.status_var.set("Live video closed.")
-
-    # Defines the method that handles the actual face swap logic for one frame.
-    def perform_live_swap(self, frame, source_image, src_landmarks):
-        # Sets the docstring for the method.
-        """Effectue le swap sur une seule image (frame) pour le mode Live."""
-        # Gets the landmarks for the face in the live video frame (the target).
-        tgt_landmarks = self.get_landmarks(frame)
-
-        # Returns the original frame if no face is detected in the target.
-        if tgt_landmarks is None:
-            return frame
-
-        # Calculates the affine transformation matrix to align source to target.
-        matrix, _ = cv2.estimateAffinePartial2D(src_landmarks.astype(np.float32), tgt_landmarks.astype(np.float32))
-
-        # Utilisation de BORDER_REPLICATE.
-        # Warps the source image onto the target position.
-        warped_src = cv2.warpAffine(source_image, matrix, (frame.shape[1], frame.shape[0]),
-                                    borderMode=cv2.BORDER_REPLICATE)
-
-        # Création du masque (simple) pour le live
-        # Calculates the convex hull of the target face.
-        hull = cv2.convexHull(tgt_landmarks)
-        # Creates a black mask.
-        mask = np.zeros(frame.shape[:2], dtype=np.uint8)
-        # Fills the hull with white (255).
-        cv2.fillConvexPoly(mask, hull, 255)
-        # Applies a small Gaussian blur for a basic blend.
-        mask = cv2.GaussianBlur(mask, (15, 15), 0)
-
-        # Converts the 1-channel mask to a 3-channel float mask (0.0 to 1.0).
-        mask3 = cv2.merge([mask, mask, mask]) / 255.0
-
-        # Blend
-        # Performs a simple weighted average blend between the warped source and the target frame.
-        blended = (warped_src.astype(np.float32) * mask3 + frame.astype(np.float32) * (1 - mask3)).astype(np.uint8)
+        # Updates the status bar, including the growth of the buffer pool per frame.
+        self.status_var.set(f"Live video closed. Buffer pool growth per frame: "
+                            f"{self.live_pool.growth_per_frame():.2f} (last frame: "
+                            f"{self.live_pool.last_frame_growth}, {self.live_pool.frames} frames).")
+        # Prints the timing statistics of the session to the console when asked (the H overlay shows them live).
+        if self.verbose:
+            print("\n".join(["Live stats:"] + self.live_stats.summary_lines()))
+        # Resets the live mode state (self.live_stats is kept for logging).
+        self.live_stop_event = None
+        self.live_threads = []
+        self.live_capture = None
+        self.live_pool = None
 
-        # Returns the final blended frame.
-        return blended
 
 
 # Checks if the script is being run directly (not imported as a module).
 if __name__ == "__main__":
+    # Imports the argparse module for the command line options (only needed when run as a script).
+    import argparse
+    # Creates the command line parser.
+    parser = argparse.ArgumentParser(description="Professional Face Swap")
+    # Adds the option selecting the live frame source.
+    parser.add_argument("--live-source", default="0",
+                        help="webcam index, video file, image folder or synthetic[:<celeb>[:<frames>]]")
+    # Adds the option printing the startup and live timings to the console.
+    parser.add_argument("--verbose", action="store_true",
+                        help="print the startup and live timings to the console (also FACESWAP_VERBOSE=1)")
+    # Parses the command line.
+    args = parser.parse_args()
     # Creates the main Tkinter window instance.
     root = Tk()
     # Creates an instance of the FaceSwapApp, passing the root window.
     app = FaceSwapApp(root)
+    # Applies the live frame source.
+    app.live_source = args.live_source
+    # Enables the console timings if asked on the command line.
+    app.verbose = app.verbose or args.verbose
     # Starts the Tkinter event loop, making the application run.
     root.mainloop()
+    # Writes the celebrity index entries computed since the last save.
+    if app.celeb_index is not None:
+        app.celeb_index.flush()
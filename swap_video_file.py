@@ -0,0 +1,402 @@
+# Imports the OpenCV library for image and video processing.
+import cv2
+# Imports the argparse module for the command line options.
+import argparse
+# Imports the time module for measuring the rendering throughput.
+import time
+# Imports the operating system module for file paths and the CPU count.
+import os
+# Imports the multiprocessing module for the parallel (sharded) rendering.
+import multiprocessing
+# Imports the tempfile module for the directory holding the rendered segments.
+import tempfile
+# Imports the shutil module for removing the segment directory.
+import shutil
+# Imports the collections module for the queue of the segments being rendered.
+import collections
+# Imports the NumPy library for the raw frame segments.
+import numpy as np
+# Imports the Tkinter-free face swap engine and the live mode helpers.
+from face_swap_engine import FaceSwapEngine, FrameBufferPool, LiveStats
+# Imports the frame sources (video file, image folder, synthetic generator).
+from frame_sources import open_frame_source
+
+# Mode vidéo sans interface : remplace le visage de chaque image d'une vidéo par celui d'une image source.
+# Aucun import de Tkinter et aucune fenêtre : utilisable sur une machine sans écran ni webcam.
+
+
+# Sets the maximum number of frames of a segment of the parallel mode. Segments hold raw frames (.npy, no
+# compression: the workers only copy, the main process only encodes once), so this bounds their size on disk.
+SEGMENT_MAX_FRAMES = 64
+
+# Sets the folder of the segments (shared memory when available, so the raw frames never reach the disk).
+SEGMENT_FOLDER = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Stores the per-process state of the parallel workers (engine and source face, loaded once).
+_worker_state = {}
+
+
+# Defines the frame loop shared by the sequential and parallel modes.
+def swap_frames(engine, cap, writer, source_image, src_landmarks, max_frames=None, stats=None):
+    """Lit cap, remplace le visage de chaque image et l'écrit dans writer. Retourne le nombre d'images."""
+    # Creates the tracking state and the buffer pool, as in live mode.
+    tracker, flow = engine.create_live_trackers()
+    pool = FrameBufferPool()
+    # Uses disabled statistics when none are provided.
+    if stats is None:
+        stats = LiveStats(enabled=False)
+    # Initializes the frame counter and the reusable frame buffer.
+    frames = 0
+    frame = None
+    # Loops until the end of the video (or of the requested range).
+    while max_frames is None or frames < max_frames:
+        # Reads the next frame into the previous frame's buffer.
+        with stats.time("capture"):
+            ret, frame = cap.read(frame)
+        # Stops at the end of the video.
+        if not ret:
+            break
+        # Swaps the source face into the frame (in place).
+        result = engine.perform_live_swap(frame, source_image, src_landmarks, tracker=tracker, flow=flow,
+                                          pool=pool, stats=stats)
+        # Writes the frame to the output video.
+        with stats.time("write"):
+            writer.write(result)
+        # Closes the accounting of this frame.
+        pool.end_frame()
+        stats.frame_shown()
+        frames += 1
+    # Returns the number of frames written.
+    return frames
+
+
+# Defines the function that swaps the source face into every frame of a video file.
+def render_video(engine, source_path, input_path, output_path, fourcc="mp4v", stats=None):
+    """Écrit output_path à partir de input_path avec le visage de source_path. Retourne (images, secondes)."""
+    # Reads the source image.
+    source_image = cv2.imread(source_path)
+    # Raises an error if the source image could not be read.
+    if source_image is None:
+        raise ValueError(f"Invalid source image: {source_path}")
+    # Gets the landmarks for the static source image.
+    src_landmarks = engine.get_landmarks(source_image)
+    # Raises an error if no face is found in the source.
+    if src_landmarks is None:
+        raise ValueError("Face not detected in the source image.")
+
+    # Opens the input (video file, image folder or synthetic source), as fast as it can be read.
+    cap = open_frame_source(input_path, realtime=False)
+    # Raises an error if the video cannot be opened.
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video: {input_path}")
+    # Keeps the frame rate of the input (25 fps if the container does not report it).
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+    # Gets the frame size of the input.
+    size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    # Opens the output video with the same frame rate and size.
+    writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*fourcc), fps, size)
+    # Raises an error if the output cannot be written.
+    if not writer.isOpened():
+        cap.release()
+        raise ValueError(f"Cannot write video: {output_path}")
+
+    # Stores the start time.
+    start = time.perf_counter()
+    # Starts a try block so the files are always closed.
+    try:
+        # Swaps the face in all frames of the input.
+        frames = swap_frames(engine, cap, writer, source_image, src_landmarks, stats=stats)
+    # Executes regardless of the outcome.
+    finally:
+        # Releases the input and output videos.
+        cap.release()
+        writer.release()
+    # Returns the number of frames and the elapsed time.
+    return frames, time.perf_counter() - start
+
+
+# Defines the initializer of every parallel worker process.
+def _init_worker(model_path, settings, source_path):
+    # Sets the docstring for the function.
+    """Charge une seule fois par processus le détecteur, le prédicteur et les points de la source."""
+    # Creates the engine and loads the Dlib models.
+    engine = FaceSwapEngine()
+    engine.load_models(model_path)
+    # Applies the engine settings of the main process.
+    for name, value in settings.items():
+        setattr(engine, name, value)
+    # Reads the source image.
+    source_image = cv2.imread(source_path)
+    # Stores the worker state (the landmarks stay None if the model or the face is missing).
+    _worker_state["engine"] = engine
+    _worker_state["source_image"] = source_image
+    _worker_state["src_landmarks"] = None
+    if engine.predictor is not None and source_image is not None:
+        _worker_state["src_landmarks"] = engine.get_landmarks(source_image)
+
+
+# Defines the writer storing the frames of a segment in a raw .npy file.
+class SegmentWriter:
+    # Sets the docstring describing the class's purpose.
+    """Écrit les images d'une plage dans un fichier .npy projeté en mémoire (copie brute, sans encodage)."""
+
+    # Defines the constructor method for the SegmentWriter class.
+    def __init__(self, path, frames, size):
+        # Creates the file holding every frame of the range.
+        self.frames = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=(frames, size[1], size[0], 3))
+        # Initializes the number of frames written.
+        self.count = 0
+
+    # Defines the method to store the next frame.
+    def write(self, frame):
+        # Raises an error if the range receives more frames than planned.
+        if self.count >= len(self.frames):
+            raise ValueError("Segment overflow.")
+        # Copies the frame into the file.
+        self.frames[self.count] = frame
+        self.count += 1
+
+    # Defines the method to close the file.
+    def release(self):
+        # Flushes and closes the mapping.
+        self.frames.flush()
+        del self.frames
+
+
+# Defines the function moving a source to a given frame.
+def seek_frame(cap, index):
+    """Place cap sur l'image index ; si le seek du conteneur n'est pas exact, lit les images une à une."""
+    # Returns immediately for the first frame.
+    if index == 0:
+        return cap
+    # Tries the seek of the container and checks the reported position.
+    if cap.set(cv2.CAP_PROP_POS_FRAMES, index) and int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == index:
+        return cap
+    # Restarts from the first frame and skips the frames before the range otherwise.
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    for _ in range(index):
+        if not cap.grab():
+            raise ValueError(f"Cannot reach frame {index}.")
+    return cap
+
+
+# Defines the task of a parallel worker: render one frame range into a segment file.
+def _render_segment(task):
+    # Sets the docstring for the function.
+    """Rend les images [start, end) de la vidéo dans un segment .npy. Retourne (index, images)."""
+    # Unpacks the task.
+    index, start, end, input_path, segment_path = task
+    # Gets the state loaded by _init_worker.
+    engine = _worker_state["engine"]
+    # Raises an error if the worker could not prepare the source face.
+    if engine.predictor is None:
+        raise ValueError("Dlib model not loaded.")
+    if _worker_state["src_landmarks"] is None:
+        raise ValueError("Face not detected in the source image.")
+
+    # Opens the input.
+    cap = open_frame_source(input_path, realtime=False)
+    # Raises an error if the video cannot be opened.
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video: {input_path}")
+    # Gets the frame size of the input.
+    size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    # Starts a try block so the files are always closed.
+    writer = None
+    try:
+        # Moves to the first frame of the range (exactly, even when the container seek is not).
+        seek_frame(cap, start)
+        # Opens the raw segment file.
+        writer = SegmentWriter(segment_path, end - start, size)
+        # Swaps the face in the frames of the range.
+        frames = swap_frames(engine, cap, writer, _worker_state["source_image"], _worker_state["src_landmarks"],
+                             max_frames=end - start)
+    # Executes regardless of the outcome.
+    finally:
+        # Releases the input video and the segment.
+        cap.release()
+        if writer is not None:
+            writer.release()
+    # Raises an error if the input ended before the range (the frame count of the container was wrong).
+    if frames != end - start:
+        raise ValueError(f"Frames {start}-{end}: only {frames} could be read (inaccurate frame count or seek).")
+    # Returns the index of the segment and its number of frames.
+    return index, frames
+
+
+# Defines the function that renders a video on several processes.
+def render_video_parallel(engine, source_path, input_path, output_path, workers, model_path, fourcc="mp4v",
+                          chunks_per_worker=4, stats=None):
+    """Découpe la vidéo en plages d'images rendues en parallèle puis les réassemble dans l'ordre.
+
+    Les processus renvoient des images brutes (segments .npy) : seul le processus principal encode, une fois ;
+    au plus deux plages par processus attendent d'être écrites, ce qui borne la place prise par les segments.
+
+    Retourne (images, secondes, processus) ; processus vaut 1 quand le rendu est retombé en mode séquentiel
+    (stats n'est alors rempli que dans ce cas, les processus de rendu ayant leurs propres mesures).
+    """
+    # Opens the input to read its properties.
+    cap = open_frame_source(input_path, realtime=False)
+    # Raises an error if the video cannot be opened.
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video: {input_path}")
+    # Gets the frame count, frame rate and frame size of the input.
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
+    size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    cap.release()
+    # Falls back to the sequential mode if the container does not report its frame count.
+    if total <= 0 or workers <= 1:
+        return render_video(engine, source_path, input_path, output_path, fourcc, stats) + (1,)
+
+    # Splits the video into more ranges than workers so that slow ranges do not leave cores idle
+    # (and into ranges of at most SEGMENT_MAX_FRAMES frames, so a segment stays small).
+    chunk_count = min(total, max(workers * chunks_per_worker, -(-total // SEGMENT_MAX_FRAMES)))
+    bounds = [total * i // chunk_count for i in range(chunk_count + 1)]
+    # Copies the engine settings so every worker renders like the main process.
+    settings = {name: value for name, value in vars(engine).items()
+                if name not in ("detector", "predictor") and isinstance(value, (int, float, str, bool))}
+
+    # Opens the output video with the same frame rate and size.
+    writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*fourcc), fps, size)
+    # Raises an error if the output cannot be written.
+    if not writer.isOpened():
+        raise ValueError(f"Cannot write video: {output_path}")
+    # Creates the directory holding the segments.
+    segment_dir = tempfile.mkdtemp(prefix="faceswap_segments_", dir=SEGMENT_FOLDER)
+    # Creates the list of tasks (index, first frame, end frame, input, segment file).
+    tasks = [(i, bounds[i], bounds[i + 1], input_path, os.path.join(segment_dir, f"segment_{i:05d}.npy"))
+             for i in range(chunk_count)]
+
+    # Initializes the frame counter.
+    frames = 0
+    # Stores the start time.
+    start = time.perf_counter()
+    # Starts a try block so the output and the segments are always cleaned up.
+    try:
+        # Starts the worker processes, each loading the models once.
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(model_path, settings, source_path)) as process_pool:
+            # Submits the first ranges (at most two per process wait to be written).
+            pending = collections.deque()
+            next_task = 0
+            while next_task < len(tasks) and len(pending) < 2 * workers:
+                pending.append(process_pool.apply_async(_render_segment, (tasks[next_task],)))
+                next_task += 1
+            # Appends the segments in order as soon as each one is finished.
+            while pending:
+                index, segment_frames = pending.popleft().get()
+                # Submits the next range so the processes stay busy while this segment is written.
+                if next_task < len(tasks):
+                    pending.append(process_pool.apply_async(_render_segment, (tasks[next_task],)))
+                    next_task += 1
+                # Maps the raw frames of the finished segment.
+                _, first, end, _, segment_path = tasks[index]
+                segment = np.load(segment_path, mmap_mode="r")
+                # Raises an error if the segment does not hold exactly its range.
+                if segment_frames != end - first or len(segment) != end - first:
+                    raise ValueError(f"Segment {index}: {segment_frames} frames for range {first}-{end}.")
+                # Encodes its frames into the output.
+                for frame in segment:
+                    writer.write(np.asarray(frame))
+                frames += len(segment)
+                # Closes and deletes the segment.
+                del segment
+                os.remove(segment_path)
+    # Executes regardless of the outcome.
+    finally:
+        # Releases the output and removes the segment directory.
+        writer.release()
+        shutil.rmtree(segment_dir, ignore_errors=True)
+    # Raises an error if frames are missing from the output.
+    if frames != total:
+        raise ValueError(f"Only {frames} of {total} frames were rendered.")
+    # Returns the number of frames, the elapsed time and the number of processes.
+    return frames, time.perf_counter() - start, workers
+
+
+# Defines the command line entry point.
+def main(argv=None):
+    # Creates the command line parser.
+    parser = argparse.ArgumentParser(description="Swap a source face into every frame of a video (headless).")
+    parser.add_argument("source", help="image containing the face to paste")
+    parser.add_argument("input", help="input video file, image folder or synthetic[:<celeb>[:<frames>]]")
+    parser.add_argument("output", help="output video file")
+    parser.add_argument("--model", default="shape_predictor_68_face_landmarks.dat",
+                        help="path of the Dlib 68-point landmark model")
+    parser.add_argument("--detection-scale", type=float, default=None,
+                        help="scale of the copy used for face detection (default: engine setting)")
+    parser.add_argument("--detect-every", type=int, default=None,
+                        help="frames tracked between two full detections (1 = detect every frame)")
+    parser.add_argument("--no-flow", action="store_true", help="disable optical-flow landmark propagation")
+    parser.add_argument("--blend", choices=("fixed", "float", "pyramid", "poisson"), default=None,
+                        help="blending backend")
+    parser.add_argument("--frame-budget-ms", type=float, default=None,
+                        help="time budget of one frame; the poisson blend falls back to alpha above it")
+    parser.add_argument("--levels", type=int, default=None, help="pyramid levels of the multi-band blend")
+    parser.add_argument("--warp", choices=("similarity", "triangles"), default=None, help="warping backend")
+    parser.add_argument("--color", type=float, default=None,
+                        help="LAB color transfer amount, 0.0 (off) to 1.0 (applied with per-channel lookup tables)")
+    parser.add_argument("--fourcc", default="mp4v", help="four-character code of the output codec")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of rendering processes (0 = one per CPU core)")
+    args = parser.parse_args(argv)
+
+    # Creates the engine and loads the Dlib models.
+    engine = FaceSwapEngine()
+    engine.load_models(args.model)
+    # Stops if the Dlib model could not be loaded.
+    if engine.predictor is None:
+        print(f"Error: Dlib model not loaded ({args.model}).")
+        return 1
+    # Applies the command line overrides to the engine settings.
+    if args.detection_scale is not None:
+        engine.live_detection_scale = args.detection_scale
+    if args.detect_every is not None:
+        engine.live_detect_every = args.detect_every
+    if args.no_flow:
+        engine.live_landmark_flow = False
+    if args.blend is not None:
+        engine.blend_backend = args.blend
+    if args.levels is not None:
+        engine.pyramid_levels = args.levels
+    if args.frame_budget_ms is not None:
+        engine.live_frame_budget_ms = args.frame_budget_ms
+    if args.warp is not None:
+        engine.warp_backend = args.warp
+    if args.color is not None:
+        engine.live_color_amount = args.color
+
+    # Gets the number of rendering processes.
+    workers = args.workers if args.workers > 0 else os.cpu_count() or 1
+
+    # Renders the video.
+    stats = LiveStats()
+    try:
+        # Renders on several processes if requested.
+        if workers > 1:
+            frames, elapsed, processes = render_video_parallel(engine, args.source, args.input, args.output,
+                                                               workers, args.model, args.fourcc, stats=stats)
+        # Renders in this process otherwise.
+        else:
+            frames, elapsed = render_video(engine, args.source, args.input, args.output, args.fourcc, stats)
+            processes = 1
+    # Reports the error and stops.
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
+
+    # Reports the throughput and the per-stage latencies.
+    throughput = frames / elapsed if elapsed > 0 else 0.0
+    print(f"Rendered {frames} frames in {elapsed:.2f} s ({throughput:.1f} fps, {processes} process(es)) "
+          f"-> {args.output}")
+    # Prints the per-stage latencies (measured only when the frames were rendered in this process).
+    if processes == 1:
+        print("\n".join(stats.summary_lines()[1:]))
+    return 0
+
+
+# Checks if the script is being run directly (not imported as a module).
+if __name__ == "__main__":
+    # Runs the entry point and exits with its status code.
+    raise SystemExit(main())
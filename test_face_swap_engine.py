@@ -0,0 +1,190 @@
+# Imports the OpenCV library for image processing.
+import cv2
+# Imports the NumPy library for array operations.
+import numpy as np
+
+# Imports the engine and its compositing helpers (no Dlib model needed).
+from face_swap_engine import (FaceSwapEngine, FrameBufferPool, TriangleWarp, blend_fixed_point, blend_seamless,
+                              seamless_clone_region)
+# Imports the application, whose still pipeline runs without a window when the landmarks are given.
+from swap_live_video_advance6 import FaceSwapApp
+
+# Tests du moteur et du pipeline image fixe, sans fenêtre ni modèle Dlib : lancer avec `python -m pytest -q`.
+
+# Sets a frontal 68-landmark layout (jaw, brows, nose, eyes, mouth) in a 120 x 120 box.
+FACE_LANDMARKS = np.array([
+    (10, 30), (11, 46), (14, 61), (18, 74), (25, 87), (32, 97), (41, 104), (50, 108), (60, 110),
+    (70, 108), (79, 104), (88, 97), (95, 87), (102, 74), (106, 61), (109, 46), (110, 30), (18, 20),
+    (26, 17), (35, 16), (44, 17), (52, 19), (68, 19), (76, 17), (85, 16), (94, 17), (102, 20),
+    (60, 32), (60, 42), (60, 52), (60, 62), (48, 68), (54, 70), (60, 71), (66, 70), (72, 68),
+    (29, 35), (34, 32), (42, 32), (47, 35), (42, 37), (34, 37), (73, 35), (78, 32), (86, 32),
+    (91, 35), (86, 37), (78, 37), (43, 85), (49, 81), (55, 79), (60, 80), (65, 79), (71, 81),
+    (77, 85), (71, 90), (65, 92), (60, 93), (55, 92), (49, 90), (46, 85), (55, 83), (60, 84),
+    (65, 83), (74, 85), (65, 87), (60, 88), (55, 87),
+], dtype=np.float64)
+
+
+# Defines the helper building a smooth test image.
+def make_image(height, width, seed):
+    """Retourne une image BGR lisse (bruit agrandi) reproductible."""
+    # Draws a small random image and enlarges it (smooth gradients, as on a face).
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 255, (height // 10, width // 10, 3), dtype=np.uint8)
+    return cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+
+
+# Defines the test of the seamless clone reused across slider updates.
+def test_blend_seamless_is_repeatable():
+    # Creates the source, the target and a square hull in the middle of the target.
+    src, dst = make_image(120, 120, 1), make_image(120, 120, 2)
+    hull = np.array([[30, 30], [89, 30], [89, 89], [30, 89]], dtype=np.int32)
+    # Prepares the region once, as the still mode caches it in the swap invariants.
+    region = seamless_clone_region(hull, dst.shape)
+    mask_before = region[1].copy()
+
+    # Composes twice with the same inputs.
+    first = blend_seamless(src, dst, region)
+    second = blend_seamless(src, dst, region)
+
+    # Checks that the cached mask is untouched and the output does not change.
+    assert np.array_equal(region[1], mask_before)
+    assert np.array_equal(first, second)
+    # Checks that the whole hull is cloned (not only its boundary) and nothing outside it changes.
+    changed = np.any(first != dst, axis=2)
+    assert changed[40:80, 40:80].mean() > 0.9
+    assert not changed[:25].any() and not changed[95:].any()
+
+
+# Defines the test of the outer ring of the triangle warp and of its scratch buffers.
+def test_triangle_warp_covers_the_mask_band():
+    # Uses the frontal layout, moved away from the border of the images.
+    points = FACE_LANDMARKS + 30
+    # Warps a uniform source onto the same landmarks, shifted.
+    warp = TriangleWarp(np.full((200, 200, 3), 200, np.uint8), points)
+    out = np.zeros((240, 240, 3), np.uint8)
+    warp.warp(points + 20, out)
+    growths = warp.pool.growths
+
+    # Builds the still mask: the hull enlarged by 15 % around its center, then blurred.
+    hull = cv2.convexHull((points + 20).astype(np.int32)).reshape(-1, 2).astype(np.float64)
+    center = hull.mean(axis=0)
+    mask = np.zeros(out.shape[:2], np.uint8)
+    cv2.fillConvexPoly(mask, (center + (hull - center) * 1.15).astype(np.int32), 255)
+    mask = cv2.GaussianBlur(mask, (25, 25), 0)
+
+    # Checks that every masked pixel comes from the triangle warp.
+    assert not ((mask > 0) & np.all(out == 0, axis=2)).any()
+    # Checks that warping again reuses the scratch buffers.
+    warp.warp(points + 20, out)
+    assert warp.pool.growths == growths
+
+
+# Defines the helper creating the application state needed by the still pipeline (no window, no Dlib model).
+def make_still_app():
+    """Retourne une FaceSwapApp sans fenêtre : seuls les réglages du moteur sont initialisés."""
+    # Skips the Tkinter constructor and initializes the engine settings only.
+    app = object.__new__(FaceSwapApp)
+    FaceSwapEngine.__init__(app)
+    return app
+
+
+# Defines the helper building a textured test image (fine noise over smooth colors).
+def make_textured_image(height, width, seed):
+    """Retourne une image BGR texturée reproductible (bruit fin sur des dégradés)."""
+    # Adds fine noise to a smooth image (textures are where reduced statistics drift).
+    rng = np.random.default_rng(seed)
+    return cv2.add(make_image(height, width, seed), rng.integers(0, 60, (height, width, 3), dtype=np.uint8))
+
+
+# Defines the test of the still face ROI against the full-frame pipeline.
+def test_still_roi_matches_full_frame():
+    # Creates a textured source and target; the target face is larger, so the source is used at full resolution.
+    app = make_still_app()
+    source, target = make_textured_image(600, 800, 3), make_textured_image(900, 1200, 4)
+    src_points = (FACE_LANDMARKS * 2 + 150).astype(np.int32)
+    tgt_points = (FACE_LANDMARKS * 3 + 400).astype(np.int32)
+
+    # Computes the swap on the padded face ROI, then on the whole frame (a padding larger than the image).
+    invariants, roi, _ = app.compute_swap(source, target, 0.8, 1.0, src_points=src_points, tgt_points=tgt_points)
+    app.still_roi_padding = 10 ** 6
+    full = app.compute_swap(source, target, 0.8, 1.0, src_points=src_points, tgt_points=tgt_points)[1]
+
+    # Checks that limiting the work to the ROI does not change the result.
+    assert np.array_equal(roi, full)
+
+    # Computes the source statistics from a full-frame warp, under the full-frame mask.
+    matrix, _ = cv2.estimateAffinePartial2D(src_points.astype(np.float32), tgt_points.astype(np.float32))
+    warped = cv2.warpAffine(source, matrix, (target.shape[1], target.shape[0]), flags=cv2.INTER_LINEAR,
+                            borderMode=cv2.BORDER_REPLICATE)
+    mask = app.create_mask(tgt_points, target.shape).astype(np.uint8) * 255
+    mean, std = cv2.meanStdDev(cv2.cvtColor(warped, cv2.COLOR_BGR2LAB), mask=mask)
+    # Checks that the statistics of the ROI are the full-frame ones.
+    assert np.allclose(invariants["src_mean"], mean.flatten()) and np.allclose(invariants["src_std"], std.flatten())
+
+
+# Defines the helper building random still invariants (face ROI inside a larger target).
+def make_random_invariants(rng):
+    """Retourne des invariants de swap aléatoires : source, cible, masque doux et ROI dans une cible plus grande."""
+    # Draws the target size and a ROI inside it.
+    height, width = rng.integers(40, 160, 2)
+    full_target = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    x0, y0 = rng.integers(0, width // 3), rng.integers(0, height // 3)
+    x1, y1 = rng.integers(x0 + 5, width + 1), rng.integers(y0 + 5, height + 1)
+    # Draws the warped source and the soft mask of the ROI.
+    warped_src = rng.integers(0, 256, (y1 - y0, x1 - x0, 3), dtype=np.uint8)
+    mask = rng.random((y1 - y0, x1 - x0, 1)).astype(np.float32)
+    # Returns the invariants used by compose_result.
+    return {"warped_src": warped_src, "target": full_target[y0:y1, x0:x1], "mask": mask,
+            "full_target": full_target, "roi": (x0, y0, x1, y1)}
+
+
+# Defines the test of the fixed-point blend against the float blend.
+def test_blend_fixed_point_matches_float_blend():
+    # Creates the application state and one pool reused for every case.
+    app = make_still_app()
+    pool = FrameBufferPool()
+    for seed in range(30):
+        # Draws random inputs and a random blend amount (no color adjustment).
+        rng = np.random.default_rng(seed)
+        invariants = make_random_invariants(rng)
+        amount = float(rng.random())
+
+        # Blends with both backends.
+        app.blend_backend = "float"
+        expected = app.compose_result(dict(invariants), amount, 0.0)
+        app.blend_backend = "fixed"
+        result = app.compose_result(dict(invariants), amount, 0.0)
+        # Checks that the fixed-point result is within 1 LSB of the float one.
+        assert np.abs(result.astype(np.int16) - expected).max() <= 1
+
+        # Checks that writing into out= and using a pool give the same pixels as a plain call.
+        alpha = cv2.convertScaleAbs(invariants["mask"][..., 0], alpha=255.0 * amount)
+        plain = blend_fixed_point(invariants["warped_src"], invariants["target"], alpha)
+        out = np.empty_like(plain)
+        assert blend_fixed_point(invariants["warped_src"], invariants["target"], alpha, out=out) is out
+        assert np.array_equal(out, plain)
+        assert np.array_equal(blend_fixed_point(invariants["warped_src"], invariants["target"], alpha, pool=pool),
+                              plain)
+
+
+# Defines the test of the lookup-table color transfer against the float color transfer.
+def test_color_transfer_lut_matches_float_path():
+    # Creates the application state.
+    app = make_still_app()
+    for seed in range(100):
+        # Draws a random source, target, hard face mask and transfer amount (full, any, or almost none: values then
+        # land on integers, where a truncation difference shows).
+        rng = np.random.default_rng(seed)
+        height, width = rng.integers(20, 120, 2)
+        src = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        target = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        mask = (rng.random((height, width)) > 0.3).astype(np.float32)
+        amount = (1.0, float(rng.random()), float(rng.random()) * 0.01)[seed % 3]
+
+        # Adjusts the colors with both backends.
+        app.color_backend = "float"
+        expected = app.adjust_colors(src, target, amount, app.compute_color_invariants(src, target, mask))
+        app.color_backend = "lut"
+        result = app.adjust_colors(src, target, amount, app.compute_color_invariants(src, target, mask))
+        # Checks that the tables reproduce the float path exactly (1 LAB step can move BGR by several LSB).
+        assert np.array_equal(result, expected)
@@ -0,0 +1,53 @@
+# Imports the OpenCV library for image and video processing.
+import cv2
+# Imports the NumPy library for array operations.
+import numpy as np
+
+# Imports the frame sources of the Live mode.
+from frame_sources import open_frame_source
+
+# Tests des sources d'images : lancer avec `python -m pytest -q`.
+
+
+# Defines the helper writing a short video whose frames have increasing gray levels.
+def write_video(path, frames):
+    """Écrit frames images 64x48 (niveaux de gris 0, 40, 80...) dans un fichier vidéo sans perte."""
+    # Writes the frames with a lossless codec so the gray levels are read back exactly.
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MPNG"), 30.0, (64, 48))
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), i * 40, dtype=np.uint8))
+    writer.release()
+
+
+# Defines the test of the looping video file source.
+def test_video_file_loops_only_when_asked(tmp_path):
+    # Writes a 3-frame video.
+    path = tmp_path / "clip.avi"
+    write_video(path, 3)
+
+    # Checks that a looping source restarts at the first frame.
+    source = open_frame_source(str(path), realtime=False, loop=True)
+    levels = [int(source.read()[1][0, 0, 0]) for _ in range(7)]
+    source.release()
+    assert levels == [0, 40, 80, 0, 40, 80, 0]
+
+    # Checks that a plain source ends after the last frame.
+    source = open_frame_source(str(path), realtime=False)
+    assert [source.read()[0] for _ in range(4)] == [True, True, True, False]
+    source.release()
+
+
+# Defines the test of the buffer reuse of the synthetic source.
+def test_synthetic_source_reuses_its_blend_buffers():
+    # Opens the synthetic source on the first celebrity and reads a first frame (the pool grows once).
+    source = open_frame_source("synthetic", realtime=False)
+    assert source.isOpened()
+    ok, frame = source.read()
+    growths = source.pool.growths
+
+    # Checks that the next frames are blended without new temporaries.
+    for _ in range(3):
+        ok, frame = source.read(frame)
+        assert ok
+    assert source.pool.growths == growths
+    source.release()